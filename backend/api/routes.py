@@ -2,13 +2,16 @@
 FastAPI route handlers.
 """
 
-from fastapi import APIRouter
+import asyncio
+import hashlib
+
+import numpy as np
+import orjson
+import torch
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from api.schemas import (
-    BankResult,
-    EdgeResult,
-    HorizonSnapshot,
-    DataMeta,
     ForecastResponse,
     PipelineResponse,
     AnalystResponse,
@@ -18,17 +21,25 @@ from api.schemas import (
     AlertCreateRequest,
 )
 import os
-from core.analyst import ReLuLuAnalyst
 from core.backtest import BacktestEngine
 from core.alerts import get_alert_manager
 from api import ticker
 from data.constants import DATA_REFRESH_INTERVAL, FORECAST_RECOMPUTE_INTERVAL
 
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 # Reference to the ForecastEngine — set by app.py
 _engine = None
 
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Serialised response bodies per route: {route: (forecast_seq, body)}
+_body_cache: dict[str, tuple[int, bytes]] = {}
+
+# forecast_seq restarts at 0 in every process; salting the ETag with a
+# per-process token keeps a restarted (or sibling) worker's tags distinct
+_ETAG_SALT = os.urandom(8).hex()
+
 
 def set_engine(engine):
     global _engine
@@ -38,91 +49,187 @@ def set_engine(engine):
 # =====================================================================
 # Helpers
 # =====================================================================
-def _format_snapshot(snap: dict, tickers: list[str]) -> HorizonSnapshot:
-    """Convert a raw engine snapshot dict into the API schema."""
-    n = len(tickers)
-    banks = []
-    for i, name in enumerate(tickers):
-        banks.append(BankResult(
-            name=name,
-            predicted_score=round(float(snap["node_scores"][i]), 6),
-            hub_score=round(float(snap["systemic_hubs"][i]), 4),
-            risk_factor=round(float(snap["risk_factor"][i]), 6),
-        ))
-
-    ob_before = snap["obligations_before"]
-    ob_after = snap["obligations_after"]
-
-    edges_before, edges_after = [], []
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            wb = float(ob_before[i][j])
-            wa = float(ob_after[i][j])
-            if wb > 0.01:
-                edges_before.append(EdgeResult(
-                    source=tickers[i], target=tickers[j],
-                    weight_before=round(wb, 4), weight_after=round(wa, 4),
-                ))
-            if wa > 0.01:
-                edges_after.append(EdgeResult(
-                    source=tickers[i], target=tickers[j],
-                    weight_before=round(wb, 4), weight_after=round(wa, 4),
-                ))
-
-    return HorizonSnapshot(
-        horizon=snap["horizon"],
-        banks=banks,
-        edges_before=edges_before,
-        edges_after=edges_after,
-        stability=round(snap["stability"], 6),
-        is_stable=snap["stability"] < 1.0,
-        payload_reduction=round(snap["payload_reduction"], 2),
-        raw_load=round(snap["raw_load"], 2),
-        net_load=round(snap["net_load"], 2),
-        risk_buffer=round(float(snap.get("risk_buffer", 0.0)), 2),
-        risk_adjusted_net_load=round(float(snap.get("risk_adjusted_net_load", snap["net_load"])), 2),
-        risk_adjusted_payload_reduction=round(float(snap.get("risk_adjusted_payload_reduction", snap["payload_reduction"])), 2),
-        worst_case_buffer=round(float(snap.get("worst_case_buffer", 0.0)), 2),
-        worst_case_net_load=round(float(snap.get("worst_case_net_load", snap["net_load"])), 2),
-        worst_case_payload_reduction=round(float(snap.get("worst_case_payload_reduction", snap["payload_reduction"])), 2),
-        obligations_before=[[round(float(v), 4) for v in row] for row in ob_before],
-        obligations_after=[[round(float(v), 4) for v in row] for row in ob_after],
-    )
+def _json_response(body: bytes, headers: dict | None = None) -> Response:
+    """Return pre-serialised JSON — skips Pydantic + jsonable_encoder.
+
+    Routes using this declare ``response_model=None`` and attach their
+    schema via ``responses=`` so OpenAPI docs are unchanged.
+    """
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _cache_headers(key: int | None) -> dict:
+    """ETag for the ticker's current forecast; empty before the first tick.
+
+    ``no-cache`` makes clients revalidate every poll, so a new tick is
+    never hidden, while an unchanged one costs only a bodyless 304.
+    """
+    if key is None or ticker.cached_forecast is None:
+        return {}
+    etag = '"' + hashlib.blake2b(f"{_ETAG_SALT}:{key}".encode(), digest_size=8).hexdigest() + '"'
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(request: Request, headers: dict) -> bool:
+    etag = headers.get("ETag")
+    if etag is None:
+        return False
+    inm = request.headers.get("if-none-match", "")
+    return etag in (t.strip().removeprefix("W/") for t in inm.split(","))
+
+
+def _cached_body(route: str, key: int) -> bytes | None:
+    hit = _body_cache.get(route)
+    return hit[1] if hit is not None and hit[0] == key else None
+
+
+def _store_body(route: str, key: int | None, payload: dict) -> bytes:
+    """Serialise *payload* and, if *key* is set, cache it for *route*."""
+    body = orjson.dumps(payload, option=_ORJSON_OPTS)
+    if key is not None:
+        _body_cache[route] = (key, body)
+    return body
+
+
+def _iter_forecast_body(route: str, key: int | None, snapshots: list[dict], metadata: dict):
+    """Yield the forecast JSON one horizon at a time.
+
+    The client can start parsing while later horizons are still being
+    encoded; once the last chunk is sent the joined body is cached.
+    """
+    parts = []
+
+    def _emit(part: bytes) -> bytes:
+        parts.append(part)
+        return part
+
+    yield _emit(b'{"horizons":[')
+    for i, snap in enumerate(snapshots):
+        yield _emit((b"," if i else b"") + orjson.dumps(snap, option=_ORJSON_OPTS))
+    yield _emit(b'],"metadata":' + orjson.dumps(metadata, option=_ORJSON_OPTS) + b"}")
+
+    if key is not None:
+        _body_cache[route] = (key, b"".join(parts))
+
+
+def _to_np(x, dtype) -> np.ndarray:
+    """One host transfer for tensors (any device); converts arrays to *dtype*, copying only if needed."""
+    if torch.is_tensor(x):
+        x = x.detach().cpu().numpy()
+    return np.asarray(x, dtype=dtype)
+
+
+def _format_snapshots(horizons: list[dict], tickers: list[str]) -> list[dict]:
+    """Convert raw engine snapshot dicts into ``HorizonSnapshot`` payloads.
+
+    All K obligation matrices are stacked into one [K, N, N] cube so the
+    diagonal mask, rounding and edge threshold scan run once per request
+    rather than once per horizon.
+    """
+    # np.stack copies — the cached forecast is never mutated
+    ob_b = np.stack([_to_np(s["obligations_before"], np.float32) for s in horizons])
+    ob_a = np.stack([_to_np(s["obligations_after"], np.float32) for s in horizons])
+    diag = np.arange(ob_b.shape[1])
+    ob_b[:, diag, diag] = 0
+    ob_a[:, diag, diag] = 0
+    ob_b_r = np.round(ob_b, 4)
+    ob_a_r = np.round(ob_a, 4)
+
+    def _edges(mask: np.ndarray) -> list[list[dict]]:
+        per_horizon = [[] for _ in horizons]
+        for k, i, j in np.argwhere(mask).tolist():
+            per_horizon[k].append({
+                "source": tickers[i], "target": tickers[j],
+                # float32 → Python float; re-round so the JSON stays 4 d.p.
+                "weight_before": round(ob_b_r[k, i, j].item(), 4),
+                "weight_after": round(ob_a_r[k, i, j].item(), 4),
+            })
+        return per_horizon
+
+    edges_before = _edges(ob_b > 0.01)
+    edges_after = _edges(ob_a > 0.01)
+
+    # Per-bank columns, rounded for all horizons at once → [K][N] floats
+    scores = np.round(np.stack([_to_np(s["node_scores"], np.float64) for s in horizons]), 6).tolist()
+    hubs = np.round(np.stack([_to_np(s["systemic_hubs"], np.float64) for s in horizons]), 4).tolist()
+    risks = np.round(np.stack([_to_np(s["risk_factor"], np.float64) for s in horizons]), 6).tolist()
+
+    snapshots = []
+    for k, snap in enumerate(horizons):
+        banks = [
+            {"name": name, "predicted_score": ps, "hub_score": hs, "risk_factor": rf}
+            for name, ps, hs, rf in zip(tickers, scores[k], hubs[k], risks[k])
+        ]
+
+        snapshots.append({
+            "horizon": snap["horizon"],
+            "banks": banks,
+            "edges_before": edges_before[k],
+            "edges_after": edges_after[k],
+            "stability": round(snap["stability"], 6),
+            "is_stable": snap["stability"] < 1.0,
+            "payload_reduction": round(snap["payload_reduction"], 2),
+            "raw_load": round(snap["raw_load"], 2),
+            "net_load": round(snap["net_load"], 2),
+            "risk_buffer": round(float(snap.get("risk_buffer", 0.0)), 2),
+            "risk_adjusted_net_load": round(float(snap.get("risk_adjusted_net_load", snap["net_load"])), 2),
+            "risk_adjusted_payload_reduction": round(float(snap.get("risk_adjusted_payload_reduction", snap["payload_reduction"])), 2),
+            "worst_case_buffer": round(float(snap.get("worst_case_buffer", 0.0)), 2),
+            "worst_case_net_load": round(float(snap.get("worst_case_net_load", snap["net_load"])), 2),
+            "worst_case_payload_reduction": round(float(snap.get("worst_case_payload_reduction", snap["payload_reduction"])), 2),
+            # ndarrays — emitted directly by orjson (OPT_SERIALIZE_NUMPY)
+            "obligations_before": ob_b_r[k],
+            "obligations_after": ob_a_r[k],
+        })
+    return snapshots
 
 
 # =====================================================================
 # Routes
 # =====================================================================
-@router.get("/forecast", response_model=ForecastResponse)
-def run_forecast():
+@router.get("/forecast", response_model=None, responses={200: {"model": ForecastResponse}})
+async def run_forecast(request: Request):
     """Multi-horizon temporal forecast — returns the latest cached result."""
+    # Read the key before the forecast: a tick landing in between then
+    # only costs a cache miss, never a stale body under a fresh key.
+    key = ticker.forecast_seq
+    headers = _cache_headers(key)
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    body = _cached_body("forecast", key)
+    if body is not None:
+        return _json_response(body, headers)
+
     result = ticker.cached_forecast
 
     if result is None:
-        result = _engine.run_forecast()
+        # Blocking torch work — keep it off the event loop
+        result = await asyncio.to_thread(_engine.run_forecast)
+        key = None
+        headers = {}
 
     meta = result["metadata"]
     tickers = meta["tickers"]
-    snapshots = [_format_snapshot(s, tickers) for s in result["horizons"]]
+    snapshots = _format_snapshots(result["horizons"], tickers)
     model_type = "TemporalGNN" if _engine.is_temporal else "SuperNodeGNN (legacy)"
 
-    return ForecastResponse(
-        horizons=snapshots,
-        metadata=DataMeta(
-            tickers=tickers,
-            num_banks=meta["num_banks"],
-            total_days=meta["total_days"],
-            date_range=list(meta["date_range"]),
-            last_updated=meta["last_updated"],
-            model_type=model_type,
-        ),
+    metadata = {
+        "tickers": tickers,
+        "num_banks": meta["num_banks"],
+        "total_days": meta["total_days"],
+        "date_range": list(meta["date_range"]),
+        "last_updated": meta["last_updated"],
+        "model_type": model_type,
+    }
+    return StreamingResponse(
+        _iter_forecast_body("forecast", key, snapshots, metadata),
+        media_type="application/json",
+        headers=headers,
     )
 
 
 @router.get("/tick")
-def tick_status():
+async def tick_status():
     """Live tick status — used by the frontend to show freshness."""
     return {
         "tick_count": ticker.tick_count,
@@ -136,7 +243,7 @@ def tick_status():
 
 
 @router.get("/config")
-def config():
+async def config():
     """Returns tick intervals so the frontend can synchronize its polling."""
     return {
         "data_refresh_interval_s": DATA_REFRESH_INTERVAL,
@@ -145,34 +252,33 @@ def config():
     }
 
 
-@router.get("/run", response_model=PipelineResponse)
-def run_pipeline():
+@router.get("/run", response_model=None, responses={200: {"model": PipelineResponse}})
+async def run_pipeline(request: Request):
     """Backward-compatible single-snapshot endpoint (horizon 1 only)."""
-    result = _engine.run_forecast()
+    key = ticker.forecast_seq
+    headers = _cache_headers(key)
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    body = _cached_body("run", key)
+    if body is not None:
+        return _json_response(body, headers)
+
+    result = ticker.cached_forecast
+
+    if result is None:
+        result = await asyncio.to_thread(_engine.run_forecast)
+        key = None
+        headers = {}
+
     tickers = result["metadata"]["tickers"]
-    snap = _format_snapshot(result["horizons"][0], tickers)
-    return PipelineResponse(
-        banks=snap.banks,
-        edges_before=snap.edges_before,
-        edges_after=snap.edges_after,
-        stability=snap.stability,
-        is_stable=snap.is_stable,
-        payload_reduction=snap.payload_reduction,
-        raw_load=snap.raw_load,
-        net_load=snap.net_load,
-        risk_buffer=snap.risk_buffer,
-        risk_adjusted_net_load=snap.risk_adjusted_net_load,
-        risk_adjusted_payload_reduction=snap.risk_adjusted_payload_reduction,
-        worst_case_buffer=snap.worst_case_buffer,
-        worst_case_net_load=snap.worst_case_net_load,
-        worst_case_payload_reduction=snap.worst_case_payload_reduction,
-        obligations_before=snap.obligations_before,
-        obligations_after=snap.obligations_after,
-    )
+    snap = _format_snapshots(result["horizons"][:1], tickers)[0]
+    return _json_response(_store_body(
+        "run", key, {k: snap[k] for k in PipelineResponse.model_fields}
+    ), headers)
 
 
 @router.get("/health")
-def health():
+async def health():
     return {
         "status": "ok",
         "model_loaded": _engine is not None,
@@ -186,6 +292,9 @@ def get_risk_assessment(horizon: int = 1):
     """
     Get AI-generated risk assessment for a specific horizon (default T+1).
     """
+    # Deferred: pulls in the openai client, only needed on this route
+    from core.analyst import ReLuLuAnalyst
+
     api_key = os.getenv("FEATHERLESS_API_KEY")
     if not api_key:
         return AnalystResponse(
@@ -4,14 +4,19 @@ on a configurable interval using asyncio tasks.
 """
 
 import asyncio
+import logging
+import time
 from datetime import datetime, timezone
 
 from data.constants import DATA_REFRESH_INTERVAL, FORECAST_RECOMPUTE_INTERVAL, MAX_TICK_ERRORS
 
+log = logging.getLogger(__name__)
+
 # --- Tick state (module-level singletons) ---
 tick_count: int = 0
 last_data_refresh: str = "—"
 last_forecast_time: str = "—"
+forecast_seq: int = 0  # bumped on every recompute; keys the HTTP body cache / ETag
 tick_running: bool = False
 tick_errors: int = 0
 cached_forecast: dict | None = None
@@ -21,17 +26,27 @@ _engine_ref = None
 _loader_ref = None
 _refresh_fn = None   # callable: () -> None
 _recompute_fn = None  # callable: () -> None
+_executor = None     # dedicated pool for the blocking jobs (None → loop default)
+
+
+_iso_cache: tuple[int, str] = (-1, "")
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    """UTC timestamp at 1 s resolution; strftime runs at most once per second."""
+    global _iso_cache
+    sec = int(time.time())
+    if sec != _iso_cache[0]:
+        _iso_cache = (sec, datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return _iso_cache[1]
 
 
-def configure(refresh_fn, recompute_fn):
+def configure(refresh_fn, recompute_fn, executor=None):
     """Called once by app.py to inject the blocking sync functions."""
-    global _refresh_fn, _recompute_fn
+    global _refresh_fn, _recompute_fn, _executor
     _refresh_fn = refresh_fn
     _recompute_fn = recompute_fn
+    _executor = executor
 
 
 def refresh_data_sync():
@@ -44,10 +59,11 @@ def refresh_data_sync():
 
 def recompute_forecast_sync():
     """Run the forecast pipeline and cache the result (blocking)."""
-    global cached_forecast, last_forecast_time
+    global cached_forecast, last_forecast_time, forecast_seq
     if _recompute_fn:
         cached_forecast = _recompute_fn()
     last_forecast_time = _now_iso()
+    forecast_seq += 1
 
 
 async def ticker_task():
@@ -59,31 +75,30 @@ async def ticker_task():
         f"forecast every {FORECAST_RECOMPUTE_INTERVAL}s"
     )
 
-    data_countdown = DATA_REFRESH_INTERVAL   # first data refresh after full interval
-    forecast_countdown = 0                    # first forecast immediately
+    loop = asyncio.get_running_loop()
+
+    # Absolute monotonic deadlines: one wake-up per due job, no drift
+    next_data = loop.time() + DATA_REFRESH_INTERVAL  # first data refresh after full interval
+    next_forecast = loop.time()                       # first forecast immediately
 
     while tick_running:
         try:
-            await asyncio.sleep(1)  # heartbeat every 1 second
-            data_countdown -= 1
-            forecast_countdown -= 1
+            await asyncio.sleep(max(0.0, min(next_data, next_forecast) - loop.time()))
 
             # --- Data refresh tick ---
-            if data_countdown <= 0:
+            if loop.time() >= next_data:
                 print(f"[TICK #{tick_count}] Refreshing market data …")
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, refresh_data_sync)
-                data_countdown = DATA_REFRESH_INTERVAL
-                forecast_countdown = 0  # force forecast after data refresh
+                await loop.run_in_executor(_executor, refresh_data_sync)
+                next_data = loop.time() + DATA_REFRESH_INTERVAL
+                next_forecast = loop.time()  # force forecast after data refresh
                 tick_count += 1
                 print(f"[TICK #{tick_count}] Data refresh complete")
 
             # --- Forecast recompute tick ---
-            if forecast_countdown <= 0:
+            if loop.time() >= next_forecast:
                 print(f"[TICK #{tick_count}] Recomputing forecast …")
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, recompute_forecast_sync)
-                forecast_countdown = FORECAST_RECOMPUTE_INTERVAL
+                await loop.run_in_executor(_executor, recompute_forecast_sync)
+                next_forecast = loop.time() + FORECAST_RECOMPUTE_INTERVAL
                 print(f"[TICK #{tick_count}] Forecast cached")
 
             tick_errors = 0
@@ -91,11 +106,9 @@ async def ticker_task():
         except asyncio.CancelledError:
             print("[TICK] Ticker cancelled")
             break
-        except Exception as exc:
-            import traceback
+        except Exception:
             tick_errors += 1
-            print(f"[TICK] Error ({tick_errors}/{MAX_TICK_ERRORS}): {exc}")
-            traceback.print_exc()
+            log.exception("[TICK] Error (%d/%d)", tick_errors, MAX_TICK_ERRORS)
             if tick_errors >= MAX_TICK_ERRORS:
                 print("[TICK] Too many errors — pausing ticker for 5 min")
                 await asyncio.sleep(300)
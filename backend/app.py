@@ -9,14 +9,20 @@ Start the server:
 import os
 import sys
 import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+import torch
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # ── Make 'backend' a package-level import root ──────────────────────
@@ -31,52 +37,118 @@ from data.loader import TimeSeriesLoader
 from api.routes import router, set_engine
 from api import ticker
 
+# Torch threading.  A single worker keeps torch's defaults (all cores);
+# with UVICORN_WORKERS > 1 the cores are split between the processes so
+# they don't oversubscribe.  RELULU_TORCH_THREADS overrides either case.
+_workers = int(os.getenv("UVICORN_WORKERS", "1"))
+_torch_threads = os.getenv("RELULU_TORCH_THREADS")
+if _torch_threads or _workers > 1:
+    torch.set_num_threads(
+        int(_torch_threads) if _torch_threads else max(1, (os.cpu_count() or 1) // _workers)
+    )
+    # Must run before any torch parallel work (interop pool is set-once).
+    # With UVICORN_WORKERS > 1 uvicorn imports this module again through
+    # "app:app", and a second call in one process raises
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already configured in this process
+
 
 # ── Blocking helpers injected into the ticker ───────────────────────
 _engine: ForecastEngine | None = None
 _loader: TimeSeriesLoader | None = None
+_model = None  # loaded (and possibly scripted) once, reused across refreshes
 
 
 def _refresh_data():
     """Download market data and rebuild the forecast engine (blocking)."""
-    global _engine, _loader
+    global _engine, _loader, _model
 
     _loader = TimeSeriesLoader(period="2y").load()
 
-    temporal_path = os.path.join(SCRIPT_DIR, "temporal_gnn_v1.pth")
-    legacy_path = os.path.join(SCRIPT_DIR, "super_node_v1.pth")
+    first_load = _model is None
+    if first_load:
+        temporal_path = os.path.join(SCRIPT_DIR, "temporal_gnn_v1.pth")
+        legacy_path = os.path.join(SCRIPT_DIR, "super_node_v1.pth")
+
+        # Opt-in: int8 dynamic quantization trades a little accuracy for speed
+        # (quantized weights don't survive the process-pool pickle)
+        quantize = os.getenv("RELULU_QUANTIZE") == "1" and _forecast_pool is None
+        if os.path.exists(temporal_path):
+            _model = ForecastEngine.load_temporal(temporal_path, quantize=quantize)
+        else:
+            _model = ForecastEngine.load_legacy(legacy_path, quantize=quantize)
+
+    _engine = ForecastEngine(_model, _loader)
+    if first_load:
+        if _forecast_pool is not None:
+            print("[APP] Forecast process pool enabled — skipping quantize/TorchScript/compile")
+        # Opt-in: torch.compile the LSTM instead of TorchScript (slow startup)
+        elif os.getenv("RELULU_COMPILE") == "1":
+            _engine.maybe_compile()
+        else:
+            _engine.maybe_script()
+        _model = _engine.model
+    set_engine(_engine)
 
-    if os.path.exists(temporal_path):
-        model = ForecastEngine.load_temporal(temporal_path)
-    else:
-        model = ForecastEngine.load_legacy(legacy_path)
 
-    _engine = ForecastEngine(model, _loader)
-    set_engine(_engine)
+def _forecast_job(engine: ForecastEngine) -> dict:
+    """Process-pool entry point (top-level so it pickles)."""
+    return engine.run_forecast()
+
+
+# Opt-in: run the CPU-bound recompute in a child process so it never holds
+# the server's GIL.  The engine is pickled per call, so it's off by default,
+# and _refresh_data leaves the model plain eager while it is on (quantized,
+# scripted and torch.compile'd modules don't pickle).
+_forecast_pool: ProcessPoolExecutor | None = None
+if os.getenv("RELULU_FORECAST_PROCESS") == "1":
+    _forecast_pool = ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    )
 
 
 def _recompute_forecast():
     """Run the forecast pipeline and return the result (blocking)."""
+    global _forecast_pool
     if _engine is None:
         return None
+    if _forecast_pool is not None:
+        try:
+            return _forecast_pool.submit(_forecast_job, _engine).result()
+        except BrokenProcessPool as e:
+            # The child died (e.g. the engine failed to unpickle there);
+            # every later submit would fail the same way
+            print(f"[APP] Forecast process pool unusable ({e}) — recomputing in-thread")
+            _forecast_pool.shutdown(wait=False, cancel_futures=True)
+            _forecast_pool = None
     return _engine.run_forecast()
 
 
 # ── Lifespan (startup / shutdown) ───────────────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load data → cache first forecast → start background ticker → yield."""
-    ticker.configure(_refresh_data, _recompute_forecast)
+    """Load data → cache first forecast → start background ticker → yield.
+
+    The first forecast doubles as the model warm-up: torch's lazy
+    one-time init is paid here rather than on the first user request.
+    """
+    # Ticker jobs get their own pool so a multi-second recompute never
+    # queues ahead of request handlers in the default executor.
+    executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv("RELULU_EXECUTOR_WORKERS", "2")),
+        thread_name_prefix="relulu-bg",
+    )
+    ticker.configure(_refresh_data, _recompute_forecast, executor=executor)
 
     try:
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, ticker.refresh_data_sync)
-        await loop.run_in_executor(None, ticker.recompute_forecast_sync)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, ticker.refresh_data_sync)
+        await loop.run_in_executor(executor, ticker.recompute_forecast_sync)
         print("[APP] Engine ready — starting live ticker")
-    except Exception as exc:
-        import traceback
-        print(f"[APP] STARTUP ERROR: {exc}")
-        traceback.print_exc()
+    except Exception:
+        logging.getLogger(__name__).exception("[APP] STARTUP ERROR")
 
     task = asyncio.create_task(ticker.ticker_task())
     print("[APP] Ticker task created, yielding control to uvicorn")
@@ -90,11 +162,18 @@ async def lifespan(app: FastAPI):
             await task
         except asyncio.CancelledError:
             pass
+        executor.shutdown(wait=False, cancel_futures=True)
+        if _forecast_pool is not None:
+            _forecast_pool.shutdown(wait=False, cancel_futures=True)
         print("[APP] Ticker stopped")
 
 
 # ── FastAPI app ─────────────────────────────────────────────────────
-app = FastAPI(title="ReLuLu / Spectra Financial Engine API", lifespan=lifespan)
+app = FastAPI(
+    title="ReLuLu / Spectra Financial Engine API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -108,4 +187,8 @@ app.include_router(router)
 
 # ── Run ─────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker runs its own ticker (and market-data download), so
+    # multi-worker mode is opt-in.  workers > 1 needs the import string;
+    # a single worker serves this module's app without re-importing it.
+    target = app if _workers == 1 else "app:app"
+    uvicorn.run(target, host="0.0.0.0", port=8000, workers=_workers)
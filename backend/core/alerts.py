@@ -5,11 +5,19 @@ Manages configurable alerts for systemic risk thresholds.
 """
 
 import json
+import math
 import os
+from bisect import bisect_right
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
 import uuid
 
+import orjson
+
+from core.storage import get_writer
+
 # Simple file-based storage for alerts
 ALERTS_STORAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "alerts.json")
 
@@ -24,7 +32,24 @@ class AlertManager:
 
     def __init__(self):
         self.alerts: List[Dict] = self._load_alerts()
-        self.triggered: List[Dict] = []
+        # Keep only last 50 triggered alerts in memory
+        self.triggered: Deque[Dict] = deque(maxlen=50)
+        self._reindex()
+
+    def _reindex(self):
+        """Rebuild the id lookup and enabled subset after any mutation."""
+        self._by_id: Dict[str, Dict] = {a["id"]: a for a in self.alerts}
+        self._enabled: List[Dict] = [a for a in self.alerts if a.get("enabled", True)]
+
+        # Per-type thresholds sorted ascending, paired with positions in
+        # _enabled — each check becomes one bisect instead of a scan.
+        by_type: Dict[str, List[tuple]] = {}
+        for pos, a in enumerate(self._enabled):
+            by_type.setdefault(a["type"], []).append((a["threshold"], pos))
+        self._sweeps: Dict[str, tuple[List[float], List[int]]] = {}
+        for alert_type, pairs in by_type.items():
+            pairs.sort()
+            self._sweeps[alert_type] = ([t for t, _ in pairs], [p for _, p in pairs])
 
     def _load_alerts(self) -> List[Dict]:
         """Load alerts from storage."""
@@ -60,12 +85,13 @@ class AlertManager:
         ]
 
     def _save_alerts(self):
-        """Save alerts to storage."""
+        """Queue alerts for a background write to storage."""
         try:
-            with open(ALERTS_STORAGE_PATH, "w") as f:
-                json.dump(self.alerts, f, indent=2)
+            data = orjson.dumps(self.alerts, option=orjson.OPT_INDENT_2)
         except Exception as e:
             print(f"[AlertManager] Failed to save alerts: {e}")
+            return
+        get_writer().enqueue(ALERTS_STORAGE_PATH, data)
 
     def create_alert(
         self,
@@ -98,6 +124,7 @@ class AlertManager:
             "created_at": datetime.now().isoformat(),
         }
         self.alerts.append(alert)
+        self._reindex()
         self._save_alerts()
         return alert
 
@@ -108,12 +135,13 @@ class AlertManager:
         Returns:
             True if deleted, False if not found
         """
-        for i, alert in enumerate(self.alerts):
-            if alert["id"] == alert_id:
-                self.alerts.pop(i)
-                self._save_alerts()
-                return True
-        return False
+        alert = self._by_id.get(alert_id)
+        if alert is None:
+            return False
+        self.alerts.remove(alert)
+        self._reindex()
+        self._save_alerts()
+        return True
 
     def update_alert(self, alert_id: str, updates: Dict) -> Optional[Dict]:
         """
@@ -126,14 +154,15 @@ class AlertManager:
         Returns:
             Updated alert or None if not found
         """
-        for alert in self.alerts:
-            if alert["id"] == alert_id:
-                for key, value in updates.items():
-                    if key in alert and key != "id":
-                        alert[key] = value
-                self._save_alerts()
-                return alert
-        return None
+        alert = self._by_id.get(alert_id)
+        if alert is None:
+            return None
+        for key, value in updates.items():
+            if key in alert and key != "id":
+                alert[key] = value
+        self._reindex()
+        self._save_alerts()
+        return alert
 
     def get_alerts(self) -> List[Dict]:
         """Get all configured alerts."""
@@ -151,42 +180,40 @@ class AlertManager:
         """
         triggered = []
         now = datetime.now().isoformat()
+        fired = []  # (position in _enabled, message, current value)
+
+        sweep = self._sweeps.get(self.ALERT_STABILITY_THRESHOLD)
+        if sweep:
+            thresholds, positions = sweep
+            stability = forecast_data.get("stability", 0)
+            # stability >= threshold  →  a prefix of the ascending list.
+            # NaN compares false against every threshold, so nothing fires
+            # (bisect would place it past the end)
+            hits = 0 if math.isnan(stability) else bisect_right(thresholds, stability)
+            for k in range(hits):
+                fired.append((positions[k], f"Stability index {stability:.4f} exceeds threshold {thresholds[k]}", stability))
+
+        sweep = self._sweeps.get(self.ALERT_PAYLOAD_CHANGE)
+        if sweep:
+            thresholds, positions = sweep
+            reduction = forecast_data.get("payload_reduction", 100)
+            # reduction < threshold  →  a suffix of the ascending list;
+            # NaN fires nothing, as above
+            start = len(thresholds) if math.isnan(reduction) else bisect_right(thresholds, reduction)
+            for k in range(start, len(thresholds)):
+                fired.append((positions[k], f"Payload reduction {reduction:.1f}% below threshold {thresholds[k]}%", reduction))
+
+        # ALERT_HUB_SHIFT would require tracking hub changes over time
+
+        fired.sort()  # back to configuration order
+        for pos, message, value in fired:
+            triggered_alert = dict(self._enabled[pos])
+            triggered_alert["triggered_at"] = now
+            triggered_alert["message"] = message
+            triggered_alert["current_value"] = value
+            triggered.append(triggered_alert)
+            self.triggered.append(triggered_alert)
 
-        for alert in self.alerts:
-            if not alert.get("enabled", True):
-                continue
-
-            is_triggered = False
-            message = ""
-
-            if alert["type"] == self.ALERT_STABILITY_THRESHOLD:
-                stability = forecast_data.get("stability", 0)
-                if stability >= alert["threshold"]:
-                    is_triggered = True
-                    message = f"Stability index {stability:.4f} exceeds threshold {alert['threshold']}"
-
-            elif alert["type"] == self.ALERT_PAYLOAD_CHANGE:
-                reduction = forecast_data.get("payload_reduction", 100)
-                if reduction < alert["threshold"]:
-                    is_triggered = True
-                    message = f"Payload reduction {reduction:.1f}% below threshold {alert['threshold']}%"
-
-            elif alert["type"] == self.ALERT_HUB_SHIFT:
-                # This would require tracking hub changes over time
-                pass
-
-            if is_triggered:
-                triggered_alert = {
-                    **alert,
-                    "triggered_at": now,
-                    "message": message,
-                    "current_value": forecast_data.get("stability") or forecast_data.get("payload_reduction"),
-                }
-                triggered.append(triggered_alert)
-                self.triggered.append(triggered_alert)
-
-        # Keep only last 50 triggered alerts in memory
-        self.triggered = self.triggered[-50:]
         return triggered
 
     def get_triggered_alerts(self, since: Optional[str] = None) -> List[Dict]:
@@ -201,11 +228,11 @@ class AlertManager:
         """
         if since:
             return [a for a in self.triggered if a["triggered_at"] > since]
-        return self.triggered[-10:]
+        return list(islice(self.triggered, max(0, len(self.triggered) - 10), None))
 
     def clear_triggered(self):
         """Clear triggered alerts history."""
-        self.triggered = []
+        self.triggered.clear()
 
 
 # Global instance
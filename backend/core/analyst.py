@@ -1,7 +1,16 @@
+from collections import OrderedDict
+import numpy as np
 from openai import OpenAI
 import os
 from typing import Dict, Any, List
 
+# Completions keyed on every figure exactly as the prompt prints it, so
+# tick-to-tick jitter below display precision hits the cache and a hit
+# never serves text written for different numbers. Module-level because
+# the API builds a fresh ReLuLuAnalyst per request.
+_COMPLETION_CACHE_SIZE = 256
+_completion_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
 
 class ReLuLuAnalyst:
     def __init__(self, api_key: str):
@@ -39,7 +48,17 @@ class ReLuLuAnalyst:
             
             # Check for multi-horizon temporal data
             all_horizons = forecast_data.get('all_horizons', None)
-            
+
+            # On a cache hit the prompt (and its _get_trend calls) never renders
+            key = self._cache_key(
+                hub, reduction, stability, horizon, is_stable,
+                raw_load, net_load, all_horizons
+            )
+            cached = _completion_cache.get(key)
+            if cached is not None:
+                _completion_cache.move_to_end(key)
+                return cached
+
             if all_horizons and len(all_horizons) > 1:
                 # Multi-horizon temporal analysis
                 prompt = self._build_temporal_prompt(
@@ -53,20 +72,46 @@ class ReLuLuAnalyst:
                     is_stable, raw_load, net_load
                 )
 
-            completion = self.client.chat.completions.create(
-                model="meta-llama/Meta-Llama-3.1-70B-Instruct",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=250,
-                temperature=0.7
-            )
-
-            return completion.choices[0].message.content.strip()
+            return self._complete(key, prompt)
 
         except Exception as e:
             return f"⚠️ AI service error: {str(e)}"
 
+    @staticmethod
+    def _cache_key(
+        hub: str, reduction: float, stability: float, horizon: int,
+        is_stable: bool, raw_load: float, net_load: float,
+        all_horizons: List[Dict] | None
+    ) -> tuple:
+        """Each figure formatted with the prompt's own spec: equal keys render equal prompts."""
+        trend = ()
+        if all_horizons and len(all_horizons) > 1:
+            trend = tuple(
+                (f"{h['stability_index']:.4f}", f"{h['reduction_pct']:.1f}", f"{h['net_load']:.2f}")
+                for h in all_horizons
+            )
+        return (
+            hub, f"{reduction:.1f}", f"{stability:.4f}", horizon, is_stable,
+            f"{raw_load:.2f}", f"{net_load:.2f}", trend
+        )
+
+    def _complete(self, key: tuple, prompt: str) -> str:
+        """LLM call whose result is cached under *key*; errors propagate and are not cached."""
+        completion = self.client.chat.completions.create(
+            model="meta-llama/Meta-Llama-3.1-70B-Instruct",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=250,
+            temperature=0.7
+        )
+        summary = completion.choices[0].message.content.strip()
+
+        _completion_cache[key] = summary
+        if len(_completion_cache) > _COMPLETION_CACHE_SIZE:
+            _completion_cache.popitem(last=False)
+        return summary
+
     def _build_single_prompt(
         self, hub: str, reduction: float, stability: float, 
         horizon: int, is_stable: bool, raw_load: float, net_load: float
@@ -95,10 +140,11 @@ Be specific and professional. Do not use generic language."""
     ) -> str:
         """Build prompt with multi-horizon temporal trend analysis."""
         
-        # Extract trend data
-        stability_trend = [h['stability_index'] for h in all_horizons]
-        reduction_trend = [h['reduction_pct'] for h in all_horizons]
-        load_trend = [h['net_load'] for h in all_horizons]
+        # Extract trend data at display precision, so the trend directions
+        # depend only on what _cache_key captures
+        stability_trend = [round(h['stability_index'], 4) for h in all_horizons]
+        reduction_trend = [round(h['reduction_pct'], 1) for h in all_horizons]
+        load_trend = [round(h['net_load'], 2) for h in all_horizons]
         
         # Calculate trend direction
         stability_direction = self._get_trend(stability_trend)
@@ -134,11 +180,13 @@ Be specific and professional. Highlight any concerning trend reversals or stabil
     @staticmethod
     def _get_trend(values: List[float]) -> str:
         """Determine trend direction from a list of values."""
-        if len(values) < 2:
+        arr = np.asarray(values, dtype=np.float64)
+        if arr.size < 2:
             return "stable"
-        
-        first_half = sum(values[:len(values)//2]) / (len(values)//2)
-        second_half = sum(values[len(values)//2:]) / (len(values) - len(values)//2)
+
+        mid = arr.size // 2
+        first_half = float(arr[:mid].mean())
+        second_half = float(arr[mid:].mean())
         
         diff = second_half - first_half
         pct_change = abs(diff / first_half * 100) if first_half != 0 else 0
@@ -5,11 +5,16 @@ Compares historical forecasts with actual outcomes to measure model accuracy.
 """
 
 import numpy as np
+from operator import itemgetter
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
 import os
 
+import orjson
+
+from core.storage import get_writer
+
 # Simple file-based storage for backtest results
 BACKTEST_STORAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "backtest_history.json")
 
@@ -25,6 +30,8 @@ class BacktestEngine:
             loader: TimeSeriesLoader instance with historical data
         """
         self.loader = loader
+        self._ticker_tuple = tuple(loader.bank_tickers)
+        self._ticker_set = frozenset(self._ticker_tuple)
         self.history: List[Dict] = self._load_history()
 
     def _load_history(self) -> List[Dict]:
@@ -38,12 +45,13 @@ class BacktestEngine:
         return []
 
     def _save_history(self):
-        """Save backtest history to file."""
+        """Queue backtest history for a background write to file."""
         try:
-            with open(BACKTEST_STORAGE_PATH, "w") as f:
-                json.dump(self.history[-100:], f, indent=2)  # Keep last 100 results
+            data = orjson.dumps(self.history[-100:], option=orjson.OPT_INDENT_2)  # Keep last 100 results
         except Exception as e:
             print(f"[Backtest] Failed to save history: {e}")
+            return
+        get_writer().enqueue(BACKTEST_STORAGE_PATH, data)
 
     def store_prediction(self, horizon: int, predictions: Dict[str, float], timestamp: Optional[str] = None):
         """
@@ -86,31 +94,36 @@ class BacktestEngine:
         Returns:
             Dict with MAE, directional accuracy, and correlation
         """
-        common_tickers = set(predictions.keys()) & set(actuals.keys())
-        if not common_tickers:
+        # Common case: both dicts hold exactly the loader's universe, so the
+        # cached order is used as-is and no set algebra is needed.
+        if predictions.keys() == self._ticker_set == actuals.keys():
+            common = self._ticker_tuple
+        else:
+            common = tuple(sorted(predictions.keys() & actuals.keys()))
+        if not common:
             return {"mae": None, "directional_accuracy": None, "correlation": None}
 
-        pred_vals = np.array([predictions[t] for t in common_tickers])
-        actual_vals = np.array([actuals[t] for t in common_tickers])
+        take = itemgetter(*common)
+        pred_vals = np.array(take(predictions), dtype=np.float64).reshape(-1)
+        actual_vals = np.array(take(actuals), dtype=np.float64).reshape(-1)
+        return self._metrics_from_arrays(pred_vals, actual_vals)
 
-        # Mean Absolute Error
-        mae = float(np.mean(np.abs(pred_vals - actual_vals)))
-
-        # Directional Accuracy (did we predict the sign correctly?)
-        pred_signs = np.sign(pred_vals)
-        actual_signs = np.sign(actual_vals)
-        directional_acc = float(np.mean(pred_signs == actual_signs))
+    @classmethod
+    def _metrics_from_arrays(cls, pred_vals: np.ndarray, actual_vals: np.ndarray) -> Dict[str, float]:
+        """
+        Metrics for one aligned prediction / outcome pair.
 
-        # Correlation
-        if np.std(pred_vals) > 0 and np.std(actual_vals) > 0:
-            correlation = float(np.corrcoef(pred_vals, actual_vals)[0, 1])
-        else:
-            correlation = 0.0
+        Args:
+            pred_vals, actual_vals: [N] arrays in the same ticker order
 
+        Returns:
+            Dict with MAE, directional accuracy, and correlation
+        """
+        mae, dir_acc, corr = cls._batch_metrics(pred_vals[None, :], actual_vals[None, :])
         return {
-            "mae": round(mae, 6),
-            "directional_accuracy": round(directional_acc, 4),
-            "correlation": round(correlation, 4),
+            "mae": mae[0].item(),
+            "directional_accuracy": dir_acc[0].item(),
+            "correlation": corr[0].item(),
         }
 
     def run_backtest(self, lookback_days: int = 30) -> Dict[str, Any]:
@@ -131,52 +144,73 @@ class BacktestEngine:
 
         returns = self.loader.bank_returns
         tickers = self.loader.bank_tickers
-        n_days = min(lookback_days, len(returns) - 1)
-
-        results = []
-        all_mae = []
-        all_dir_acc = []
 
-        for i in range(n_days, 0, -1):
-            # Use returns from day -i-1 as "prediction" proxy (lag correlation)
-            if i + 1 >= len(returns):
-                continue
+        # Day t is "predicted" by day t-1's returns (lag correlation), so
+        # each backtested day needs one prior row.
+        vals = returns[tickers].to_numpy(dtype=np.float64)  # [T, N]
+        T = len(vals)
+        n_days = max(0, min(lookback_days, T - 2))
+        preds = vals[T - n_days - 1 : T - 1]  # [D, N]
+        acts = vals[T - n_days :]             # [D, N]
 
-            pred_day = returns.iloc[-(i + 1)]
-            actual_day = returns.iloc[-i]
+        mae, dir_acc, corr = self._batch_metrics(preds, acts)
 
-            predictions = {t: float(pred_day[t]) for t in tickers}
-            actuals = {t: float(actual_day[t]) for t in tickers}
+        def _date(d: int) -> str:
+            idx = returns.index[T - n_days + d]
+            return str(idx.date()) if hasattr(idx, "date") else str(idx)
 
-            metrics = self._compute_metrics(predictions, actuals)
-            
+        # Per-day dicts only for the entries we actually return
+        results = []
+        for d in range(min(n_days, 10)):
             results.append({
-                "date": str(returns.index[-i].date()) if hasattr(returns.index[-i], "date") else str(returns.index[-i]),
-                "predictions": predictions,
-                "actuals": actuals,
-                "metrics": metrics,
+                "date": _date(d),
+                "predictions": dict(zip(tickers, preds[d].tolist())),
+                "actuals": dict(zip(tickers, acts[d].tolist())),
+                "metrics": {
+                    "mae": mae[d].item(),
+                    "directional_accuracy": dir_acc[d].item(),
+                    "correlation": corr[d].item(),
+                },
             })
 
-            if metrics["mae"] is not None:
-                all_mae.append(metrics["mae"])
-            if metrics["directional_accuracy"] is not None:
-                all_dir_acc.append(metrics["directional_accuracy"])
-
         # Aggregate metrics
         aggregate = {
-            "total_days": len(results),
-            "avg_mae": round(float(np.mean(all_mae)), 6) if all_mae else None,
-            "avg_directional_accuracy": round(float(np.mean(all_dir_acc)), 4) if all_dir_acc else None,
-            "best_day": max(results, key=lambda x: x["metrics"]["directional_accuracy"] or 0)["date"] if results else None,
-            "worst_day": min(results, key=lambda x: x["metrics"]["directional_accuracy"] or 1)["date"] if results else None,
+            "total_days": n_days,
+            "avg_mae": round(float(mae.mean()), 6) if n_days else None,
+            "avg_directional_accuracy": round(float(dir_acc.mean()), 4) if n_days else None,
+            "best_day": _date(int(np.argmax(dir_acc))) if n_days else None,
+            "worst_day": _date(int(np.argmin(dir_acc))) if n_days else None,
         }
 
         return {
             "aggregate": aggregate,
-            "results": results[:10],  # Return only last 10 days for brevity
+            "results": results,  # Return only the first 10 days for brevity
             "timestamp": datetime.now().isoformat(),
         }
 
+    @staticmethod
+    def _batch_metrics(preds: np.ndarray, acts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Row-wise MAE, directional accuracy and Pearson correlation.
+
+        Args:
+            preds, acts: [D, N] aligned prediction / outcome matrices
+
+        Returns:
+            (mae, directional_accuracy, correlation), each [D], rounded
+            to 6 / 4 / 4 decimals
+        """
+        mae = np.mean(np.abs(preds - acts), axis=1)
+        dir_acc = np.mean(np.sign(preds) == np.sign(acts), axis=1)
+
+        pc = preds - preds.mean(axis=1, keepdims=True)
+        ac = acts - acts.mean(axis=1, keepdims=True)
+        denom = np.sqrt((pc * pc).sum(axis=1) * (ac * ac).sum(axis=1))
+        # denom is zero exactly when either row is constant
+        corr = np.divide((pc * ac).sum(axis=1), denom, out=np.zeros_like(denom), where=denom > 0)
+
+        return np.round(mae, 6), np.round(dir_acc, 4), np.round(corr, 4)
+
     def get_history(self, limit: int = 10) -> List[Dict]:
         """Get recent backtest history entries."""
         return self.history[-limit:]
@@ -10,6 +10,9 @@ Pipeline per horizon:
   4. Circular netting → payload reduction
 """
 
+import copy
+import time
+
 import torch
 import numpy as np
 
@@ -26,7 +29,7 @@ class ForecastEngine:
 
     def __init__(
         self,
-        model: TemporalGNN | SuperNodeGNN,
+        model: TemporalGNN | SuperNodeGNN | torch.jit.ScriptModule,
         loader: TimeSeriesLoader,
         device: str | None = None,
     ):
@@ -35,11 +38,39 @@ class ForecastEngine:
         self.model.eval()
         self.loader = loader
         self.optimizer = OptimizationNode()
-        self.is_temporal = isinstance(model, TemporalGNN)
+        # bf16 autocast for the GNN forward on GPUs with native support;
+        # CPU inference stays fp32
+        self.use_autocast = (
+            torch.device(self.device).type == "cuda" and torch.cuda.is_bf16_supported()
+        )
+        # Device-resident model inputs, valid while loader.data_version matches
+        self._inputs: tuple[torch.Tensor, ...] | None = None
+        self._inputs_version: int | None = None
+        # ScriptModules keep the eager class name in `original_name`;
+        # frozen ones are still recognisable by the preserved method
+        self.is_temporal = isinstance(model, TemporalGNN) or (
+            getattr(model, "original_name", None) == TemporalGNN.__name__
+        ) or (
+            isinstance(model, torch.jit.ScriptModule) and hasattr(model, "forecast_single")
+        )
 
     # ------------------------------------------------------------------
     # Model loading helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def _quantize(m: torch.nn.Module, device: str) -> torch.nn.Module:
+        """Dynamic int8 quantization of Linear/LSTM layers (CPU only).
+
+        GCNConv keeps its own linear type, so only the recurrent and
+        head layers are converted; the rest of the model stays fp32.
+        """
+        if device != "cpu":
+            print("[ForecastEngine] int8 quantization is CPU-only, skipping")
+            return m
+        return torch.ao.quantization.quantize_dynamic(
+            m, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+        )
+
     @staticmethod
     def load_temporal(
         path: str,
@@ -47,6 +78,7 @@ class ForecastEngine:
         hidden_dim: int = 64,
         num_horizons: int = 5,
         device: str | None = None,
+        quantize: bool = False,
     ) -> TemporalGNN:
         device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         m = TemporalGNN(
@@ -56,6 +88,8 @@ class ForecastEngine:
         ).to(device)
         m.load_state_dict(torch.load(path, map_location=device))
         m.eval()
+        if quantize:
+            m = ForecastEngine._quantize(m, device)
         return m
 
     @staticmethod
@@ -64,6 +98,7 @@ class ForecastEngine:
         node_features: int = 2,
         hidden_dim: int = 32,
         device: str | None = None,
+        quantize: bool = False,
     ) -> SuperNodeGNN:
         device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         m = SuperNodeGNN(
@@ -71,32 +106,145 @@ class ForecastEngine:
         ).to(device)
         m.load_state_dict(torch.load(path, map_location=device))
         m.eval()
+        if quantize:
+            m = ForecastEngine._quantize(m, device)
         return m
 
+    def maybe_script(self, warmup: int = 20, iters: int = 50) -> bool:
+        """Swap in a TorchScript copy of the model if it benchmarks faster.
+
+        The scripted copy is frozen and passed through
+        ``optimize_for_inference`` (weights inlined as constants, dropout
+        removed, conv/linear fusions) when that succeeds.  Scripting can
+        lose to eager on graphs this small, and its first calls pay
+        profiling overhead — so warm both up, time them, and keep the
+        winner.  Returns True if the scripted model was kept.
+        """
+        try:
+            scripted = torch.jit.script(self.model)
+            try:
+                # freeze() drops every method but forward unless preserved
+                methods = ["forecast_single"] if self.is_temporal else None
+                scripted = torch.jit.optimize_for_inference(scripted, other_methods=methods)
+            except Exception as exc:
+                print(f"[ForecastEngine] Freezing failed, using plain TorchScript: {exc}")
+            scripted_t = self._benchmark(scripted, warmup, iters)
+        except Exception as exc:
+            print(f"[ForecastEngine] TorchScript unavailable, keeping eager: {exc}")
+            return False
+
+        eager_t = self._benchmark(self.model, warmup, iters)
+        keep = scripted_t < eager_t
+        print(
+            f"[ForecastEngine] eager={eager_t / iters * 1e3:.3f}ms  "
+            f"scripted={scripted_t / iters * 1e3:.3f}ms  → "
+            f"{'scripted' if keep else 'eager'}"
+        )
+        if keep:
+            self.model = scripted
+        return keep
+
+    def maybe_compile(self, warmup: int = 20, iters: int = 50) -> bool:
+        """Swap in a copy whose LSTM is ``torch.compile``d, if it benchmarks faster.
+
+        Only the recurrent block is compiled: it dominates at these tiny
+        shapes, and PyG's message passing plus the cached-graph check in
+        TemporalGNN would only cause graph breaks.  Replaces
+        ``maybe_script`` (a compiled submodule cannot be scripted).
+        Returns True if the compiled copy was kept.
+        """
+        if isinstance(self.model, torch.jit.ScriptModule) or not hasattr(self.model, "lstm"):
+            return False
+        try:
+            compiled = copy.deepcopy(self.model)
+            compiled.lstm = torch.compile(compiled.lstm, mode="reduce-overhead")
+            # The first calls pay for compilation; warm-up absorbs them
+            compiled_t = self._benchmark(compiled, warmup, iters)
+        except Exception as exc:
+            print(f"[ForecastEngine] torch.compile unavailable, keeping eager: {exc}")
+            return False
+
+        eager_t = self._benchmark(self.model, warmup, iters)
+        keep = compiled_t < eager_t
+        print(
+            f"[ForecastEngine] eager={eager_t / iters * 1e3:.3f}ms  "
+            f"compiled={compiled_t / iters * 1e3:.3f}ms  → "
+            f"{'compiled' if keep else 'eager'}"
+        )
+        if keep:
+            self.model = compiled
+        return keep
+
+    def _benchmark(self, m, warmup: int, iters: int) -> float:
+        """Wall time of *iters* forwards on the cached inputs, after *warmup*."""
+        edge_index, _, _, _, x = self._device_inputs()
+        with torch.inference_mode():
+            for _ in range(warmup):
+                m(x, edge_index)
+            if self.device == "cuda":
+                torch.cuda.synchronize()
+            t0 = time.perf_counter()
+            for _ in range(iters):
+                m(x, edge_index)
+            if self.device == "cuda":
+                torch.cuda.synchronize()
+            return time.perf_counter() - t0
+
+    def _device_inputs(self) -> tuple[torch.Tensor, ...]:
+        """
+        Loader-derived inputs on ``self.device``, rebuilt only when the
+        loader has reloaded its data.
+
+        Returns:
+            (edge_index, liquidity, base_obligations, risk_factor, latest_window)
+        """
+        version = self.loader.data_version
+        if self._inputs is None or self._inputs_version != version:
+            cuda = torch.device(self.device).type == "cuda"
+
+            def _upload(t: torch.Tensor) -> torch.Tensor:
+                # Pinned staging lets the five copies queue asynchronously
+                if cuda:
+                    return t.pin_memory().to(self.device, non_blocking=True)
+                return t.to(self.device)
+
+            base_obl = _upload(self.loader.build_base_obligations())
+            n = base_obl.shape[-1]
+            # Zero the diagonal once here; _build_obligations relies on it
+            base_obl = base_obl * (1 - torch.eye(n, device=self.device))
+            self._inputs = (
+                _upload(self.loader.edge_index),
+                _upload(self.loader.build_liquidity()),
+                base_obl,
+                _upload(self.loader.build_time_series_risk_factor()),
+                _upload(self.loader.get_latest_window()),  # [N, W, F]
+            )
+            self._inputs_version = version
+        return self._inputs
+
     # ------------------------------------------------------------------
     # Per-horizon risk analysis
     # ------------------------------------------------------------------
     def _analyse_horizon(
         self,
-        node_scores: torch.Tensor,
-        liquidity: torch.Tensor,
-        base_obligations: torch.Tensor,
-        risk_factor: torch.Tensor,
+        node_scores: np.ndarray,
+        obligations: np.ndarray,
+        risk_adj: np.ndarray,
+        risk_factor: np.ndarray,
+        risk_buffer: float,
+        worst_case_buffer: float,
     ) -> dict:
-        """Run the full Jacobian → hubs → netting pipeline for one horizon."""
-        pred_O = self._build_obligations(node_scores, base_obligations)
+        """Run hubs → netting → load figures for one horizon.
 
-        risk_adj = self._risk_jacobian(pred_O, liquidity)
+        Obligations, the risk Jacobian and both liquidity buffers are
+        computed for all horizons at once in ``run_forecast``; this takes
+        host views of the per-horizon slices.
+        """
         hubs, stability = self.optimizer.get_systemic_hubs(risk_adj)
 
-        netted, raw_load, net_load = self.optimizer.minimize_payload(pred_O, hubs)
+        netted, raw_load, net_load = self.optimizer.minimize_payload(obligations, hubs)
         pct = ((raw_load - net_load) / raw_load * 100) if raw_load > 0 else 0.0
 
-        # Risk-adjusted required money: add a buffer proportional to risky outflows
-        outflow = torch.sum(pred_O, dim=1)
-        risk_buffer = float(
-            (risk_factor * outflow).sum().detach().cpu().item()
-        ) * float(RISK_BUFFER_MULTIPLIER)
         risk_adjusted_net_load = float(net_load) + risk_buffer
         risk_adjusted_pct = max(
             0.0,
@@ -105,13 +253,6 @@ class ForecastEngine:
             else 0.0,
         )
 
-        # Worst-case: buffer full outflow for top-risk banks
-        n = int(risk_factor.shape[0])
-        k = max(1, int(np.ceil(n * float(WORST_CASE_TOP_FRACTION))))
-        _, idx = torch.topk(risk_factor, k=k)
-        worst_case_buffer = float(outflow[idx].sum().detach().cpu().item()) * float(
-            RISK_BUFFER_MULTIPLIER
-        )
         worst_case_net_load = float(net_load) + worst_case_buffer
         worst_case_pct = max(
             0.0,
@@ -121,10 +262,10 @@ class ForecastEngine:
         )
 
         return {
-            "node_scores": node_scores.detach().cpu().numpy(),
-            "risk_factor": risk_factor.detach().cpu().numpy(),
-            "obligations_before": pred_O.detach().cpu().numpy(),
-            "obligations_after": netted,
+            "node_scores": node_scores,
+            "risk_factor": risk_factor,
+            "obligations_before": obligations,
+            "obligations_after": np.ascontiguousarray(netted, dtype=np.float32),
             "systemic_hubs": hubs,
             "stability": float(stability),
             "payload_reduction": float(pct),
@@ -150,32 +291,49 @@ class ForecastEngine:
           "metadata": { tickers, date_range, … },
         }
         """
-        edge_index = self.loader.edge_index.to(self.device)
-        liquidity = self.loader.build_liquidity().to(self.device)
-        base_obl = self.loader.build_base_obligations().to(self.device)
-        ts_risk = self.loader.build_time_series_risk_factor().to(self.device)
-        latest = self.loader.get_latest_window().to(self.device)  # [N, W, F]
-
-        if self.is_temporal:
-            with torch.no_grad():
-                all_forecasts = self.model.forecast_single(latest, edge_index)
-
-            horizons = []
-            for k in range(all_forecasts.shape[0]):
-                snap = self._analyse_horizon(
-                    all_forecasts[k],
-                    liquidity,
-                    base_obl,
-                    ts_risk,
-                )
-                snap["horizon"] = k + 1
-                horizons.append(snap)
-        else:
-            with torch.no_grad():
-                scores = self.model(latest, edge_index).squeeze(-1)
-            snap = self._analyse_horizon(scores, liquidity, base_obl, ts_risk)
-            snap["horizon"] = 1
-            horizons = [snap]
+        edge_index, liquidity, base_obl, ts_risk, latest = self._device_inputs()
+
+        with torch.inference_mode(), torch.autocast(
+            device_type=torch.device(self.device).type,
+            dtype=torch.bfloat16,
+            enabled=self.use_autocast,
+        ):
+            if self.is_temporal:
+                all_forecasts = self.model.forecast_single(latest, edge_index)  # [H, N]
+            else:
+                all_forecasts = self.model(latest, edge_index).squeeze(-1).unsqueeze(0)  # [1, N]
+        # Obligation / Jacobian arithmetic always runs in fp32
+        all_forecasts = all_forecasts.float()
+
+        # Dense tensor work for every horizon in one batched pass
+        pred_O = self._build_obligations(all_forecasts, base_obl)  # [H, N, N]
+        risk_adj = self._risk_jacobian(pred_O, liquidity)  # [H, N, N]
+
+        buffers = self._liquidity_buffers(pred_O, ts_risk)  # [H, 2]
+
+        # Everything the NumPy side needs, packed into one device→host copy
+        H, N = all_forecasts.shape
+        parts = (all_forecasts, ts_risk, pred_O, risk_adj, buffers)
+        host = torch.cat([t.reshape(-1) for t in parts]).detach().cpu().numpy()
+        scores_h, risk_h, obl_h, jac_h, buf_h = np.split(
+            host, np.cumsum([t.numel() for t in parts[:-1]])
+        )
+        scores_h = scores_h.reshape(H, N)
+        obl_h = obl_h.reshape(H, N, N)
+        jac_h = jac_h.reshape(H, N, N)
+        buf_h = buf_h.reshape(H, 2).tolist()
+
+        horizons = []
+        for k in range(H):
+            snap = self._analyse_horizon(
+                scores_h[k],
+                obl_h[k],
+                jac_h[k],
+                risk_h,
+                *buf_h[k],
+            )
+            snap["horizon"] = k + 1
+            horizons.append(snap)
 
         return {
             "horizons": horizons,
@@ -190,28 +348,72 @@ class ForecastEngine:
         node_scores: torch.Tensor,
         base_obligations: torch.Tensor,
     ) -> torch.Tensor:
-        """Scale obligations by predicted node stress (amplified 100×)."""
+        """Scale obligations by predicted node stress (amplified 100×).
+
+        Args:
+            node_scores: [..., N] scores; leading dims (e.g. horizons) broadcast
+            base_obligations: [N, N] with a zero diagonal
+
+        Returns:
+            [..., N, N] obligations; the row scale is strictly positive,
+            so the zero diagonal carries through without a separate pass
+        """
         base_obligations = base_obligations.to(node_scores.device)
-        amplified = torch.clamp(node_scores * 100, min=-0.9, max=2.0)
-        scale = 1 + amplified  # range [0.1 … 3.0]
-        obligations = base_obligations * scale.unsqueeze(-1)
-        obligations = torch.clamp(obligations, min=0)
-        obligations.fill_diagonal_(0)
-        return obligations
+        # Two allocations total; every later step runs in place on them
+        scale = (node_scores * 100).clamp_(min=-0.9, max=2.0).add_(1)  # range [0.1 … 3.0]
+        return (base_obligations * scale.unsqueeze(-1)).clamp_(min=0)
 
     @staticmethod
+    def _liquidity_buffers(
+        pred_O: torch.Tensor, risk_factor: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Extra liquidity to hold on top of the net load, per horizon.
+
+        Args:
+            pred_O: [H, N, N] obligations
+            risk_factor: [N] per-bank risk in [0, 1]
+
+        Returns:
+            [H, 2] tensor of (risk_buffer, worst_case_buffer):
+            outflows weighted by risk, and full outflows of the
+            top-risk banks, both scaled by RISK_BUFFER_MULTIPLIER
+        """
+        outflow = torch.sum(pred_O, dim=-1)  # [H, N]
+        n = int(risk_factor.shape[0])
+        k = max(1, int(np.ceil(n * float(WORST_CASE_TOP_FRACTION))))
+        _, idx = torch.topk(risk_factor, k=k)
+        return torch.stack(
+            [(outflow * risk_factor).sum(-1), outflow[:, idx].sum(-1)], dim=-1
+        ) * float(RISK_BUFFER_MULTIPLIER)
+
+    @staticmethod
+    @torch.inference_mode()
     def _risk_jacobian(
         pred_O: torch.Tensor, liquidity: torch.Tensor
     ) -> torch.Tensor:
-        pred_O = pred_O.clone().detach().requires_grad_(True)
-        liquidity = liquidity.clone().detach()
-
-        def flow_score(O_input):
-            inflow = torch.sum(O_input.T, dim=1)
-            outflow = torch.sum(O_input, dim=1)
-            net = (liquidity + inflow) - outflow
-            scale = outflow.clamp(min=1.0)
-            return torch.sigmoid(-net / scale)
-
-        J = torch.autograd.functional.jacobian(flow_score, pred_O)
-        return J.sum(dim=2)
+        """
+        Summed Jacobian R[i, j] = Σ_k ∂f_i/∂O[j, k] of the flow score
+
+            f_i = sigmoid(-net_i / scale_i)
+            net_i = liquidity_i + Σ_k O[k, i] - Σ_k O[i, k]
+            scale_i = max(Σ_k O[i, k], 1)
+
+        in closed form.  Every row j of O feeds inflow_i once (k = i), and
+        only row i feeds outflow_i and scale_i, so with
+        g_i = f_i (1 - f_i) / scale_i:
+
+            R[i, j] = -g_i + δ_ij · N · g_i · (1 + m_i · net_i / scale_i)
+
+        where m_i = [outflow_i >= 1] is the clamp's gradient mask.
+        Leading batch dims of ``pred_O`` ([..., N, N]) carry through.
+        """
+        n = pred_O.shape[-1]
+        inflow = torch.sum(pred_O, dim=-2)
+        outflow = torch.sum(pred_O, dim=-1)
+        net = (liquidity + inflow) - outflow
+        scale = outflow.clamp(min=1.0)
+        f = torch.sigmoid(-net / scale)
+        g = f * (1 - f) / scale
+        m = (outflow >= 1.0).to(pred_O.dtype)
+        return torch.diag_embed(n * g * (1 + m * net / scale)) - g.unsqueeze(-1)
@@ -2,14 +2,33 @@
 Optimization Node
 ==================
 Eigen-decomposition for systemic hub detection +
-circular netting for CCP payload minimization.
+circular netting (as a min-cost flow LP) for CCP payload minimization.
 """
 
 import numpy as np
-import networkx as nx
+from scipy.optimize import linprog
+from scipy.sparse.linalg import ArpackError, eigs, eigsh
+from scipy.sparse import coo_matrix
+
+
+def _as_array(x) -> np.ndarray:
+    """Host float64 view of a torch tensor (any device) or array-like."""
+    if hasattr(x, "detach"):
+        x = x.detach().cpu().numpy()
+    return np.asarray(x, dtype=np.float64)
 
 
 class OptimizationNode:
+    POWER_ITERS = 100
+    POWER_TOL = 1e-8
+    # Relative eigen-residual |Mv - λv| / |λ| a converged iterate must meet
+    RESIDUAL_TOL = 1e-6
+    # Below this size a dense solve beats ARPACK's setup cost
+    ARPACK_MIN_N = 32
+    # Relative cost bump on high-centrality edges (centrality <= 1), so
+    # the result is within 0.1% of the minimum netted volume
+    HUB_TIEBREAK = 1e-3
+
     def __init__(self):
         pass
 
@@ -18,7 +37,51 @@ class OptimizationNode:
         Uses Eigen-decomposition to find which banks are 'load bearing'.
         Returns (centrality_scores, stability_index).
         """
-        eigenvalues, eigenvectors = np.linalg.eig(risk_matrix.detach().numpy())
+        M = _as_array(risk_matrix)
+
+        # Seeded random start: a structured one (e.g. uniform) can itself be
+        # an eigenvector of a non-dominant eigenvalue and stall there
+        v0 = np.random.default_rng(0).standard_normal(M.shape[0])
+        v0 /= np.linalg.norm(v0)
+
+        # Power iteration: only the dominant eigenpair is needed
+        v = v0
+        for _ in range(self.POWER_ITERS):
+            w = M @ v
+            lam = np.linalg.norm(w)
+            if lam == 0.0:
+                break
+            w /= lam
+            # Converged up to sign (a negative dominant eigenvalue flips v)
+            if min(np.abs(w - v).max(), np.abs(w + v).max()) < self.POWER_TOL:
+                # A small step can also mean slow drift; accept only a true
+                # eigenpair, with λ from the Rayleigh quotient
+                Mw = M @ w
+                rq = w @ Mw
+                if np.linalg.norm(Mw - rq * w) <= self.RESIDUAL_TOL * abs(rq):
+                    return np.abs(w), abs(rq)
+                break
+            v = w
+
+        # No single dominant eigenvalue (e.g. ±λ pair) — fall back to a
+        # proper eigensolver, using the real symmetric one when it applies
+        symmetric = np.allclose(M, M.T)
+        if M.shape[0] >= self.ARPACK_MIN_N:
+            # Arnoldi/Lanczos for the dominant pair only
+            solver = eigsh if symmetric else eigs
+            try:
+                eigenvalues, eigenvectors = solver(
+                    M, k=1, which="LM", maxiter=200, tol=1e-6,
+                    v0=v0,
+                )
+                return np.abs(eigenvectors[:, 0]), float(np.abs(eigenvalues[0]))
+            except ArpackError:
+                pass  # ARPACK did not converge — dense solve below
+
+        if symmetric:
+            eigenvalues, eigenvectors = np.linalg.eigh(M)
+        else:
+            eigenvalues, eigenvectors = np.linalg.eig(M)
 
         # The principal eigenvector (largest eigenvalue) gives node centrality
         idx = np.argmax(np.abs(eigenvalues))
@@ -31,43 +94,59 @@ class OptimizationNode:
         """
         Performs circular netting, prioritizing high-risk hubs.
         Returns (optimized_matrix, initial_volume, final_volume).
+
+        Netting is solved as one LP rather than by cancelling cycles one
+        at a time: residual flows ``0 <= f_ij <= W_ij`` on existing edges
+        that keep every bank's net position, at minimum total volume.
+        W - f is then a circulation, i.e. exactly what cycle netting
+        removes.  Centrality only breaks ties, so hub exposures are the
+        first to be netted away.  Residual flows <= 1e-5 are zeroed, so
+        net positions hold to within that tolerance per edge.
         """
-        G = nx.DiGraph(predicted_trades.detach().numpy())
-        initial_volume = G.size(weight="weight")
+        W = _as_array(predicted_trades)  # read-only here; no defensive copy
+        initial_volume = W.sum()
+        centrality = np.asarray(centrality_scores, dtype=np.float64)
 
         try:
-            cycles = list(nx.simple_cycles(G))
-            # Sort cycles by risk weight (sum of centrality of nodes in cycle)
-            cycles.sort(
-                key=lambda c: sum(centrality_scores[n] for n in c), reverse=True
+            n = W.shape[0]
+            rows, cols = np.nonzero(W > 0)
+            off = rows != cols  # self-loops always net to zero
+            rows, cols = rows[off], cols[off]
+            num_edges = len(rows)
+            if num_edges == 0:
+                # Nothing but self-loops: everything nets away
+                optimized = np.zeros_like(W)
+                return optimized, initial_volume, optimized.sum()
+
+            # Flow conservation: out - in == net position, per bank
+            A_eq = coo_matrix(
+                (
+                    np.concatenate([np.ones(num_edges), -np.ones(num_edges)]),
+                    (np.concatenate([rows, cols]), np.tile(np.arange(num_edges), 2)),
+                ),
+                shape=(n, num_edges),
+            ).tocsr()
+            b_eq = W.sum(axis=1) - W.sum(axis=0)
+
+            cost = 1.0 + self.HUB_TIEBREAK * 0.5 * (centrality[rows] + centrality[cols])
+            res = linprog(
+                cost,
+                A_eq=A_eq,
+                b_eq=b_eq,
+                bounds=np.column_stack([np.zeros(num_edges), W[rows, cols]]),
+                method="highs",
             )
+            if not res.success:
+                raise RuntimeError(res.message)
 
-            for cycle in cycles:
-                edges = list(zip(cycle, cycle[1:] + [cycle[0]]))
-                if not edges:
-                    continue
-
-                weights = []
-                valid_cycle = True
-                for u, v in edges:
-                    if G.has_edge(u, v):
-                        weights.append(G[u][v]["weight"])
-                    else:
-                        valid_cycle = False
-                        break
-
-                if valid_cycle and weights:
-                    min_val = min(weights)
-                    for u, v in edges:
-                        G[u][v]["weight"] -= min_val
-                        if G[u][v]["weight"] <= 1e-5:
-                            G.remove_edge(u, v)
+            flows = res.x
+            flows[flows <= 1e-5] = 0.0
+            optimized = np.zeros_like(W)
+            optimized[rows, cols] = flows
 
         except Exception as e:
             print(f"Netting optimization skipped: {e}")
+            optimized = W.copy()
 
-        final_volume = G.size(weight="weight")
-        optimized_matrix = nx.to_numpy_array(
-            G, nodelist=range(len(centrality_scores))
-        )
-        return optimized_matrix, initial_volume, final_volume
+        final_volume = optimized.sum()
+        return optimized, initial_volume, final_volume
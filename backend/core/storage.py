@@ -0,0 +1,87 @@
+"""
+Persistent Writer
+==================
+Coalescing background writer for the small JSON stores
+(alerts.json, backtest_history.json).
+"""
+
+import atexit
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+class PersistentWriter:
+    """Writes files on a background thread, latest payload per path wins."""
+
+    def __init__(self):
+        self._pending: Dict[str, bytes] = {}
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, path: str, data: bytes):
+        """
+        Schedule *data* to be written to *path*.
+
+        Any write for the same path still queued is replaced, so a burst
+        of updates costs one write.
+        """
+        with self._cond:
+            self._pending[path] = data
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="relulu-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued write has hit disk. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout=timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                batch, self._pending = self._pending, {}
+                self._busy = True
+
+            for path, data in batch.items():
+                try:
+                    _atomic_write(path, data)
+                except Exception as e:
+                    print(f"[Storage] Failed to write {path}: {e}")
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Temp file in the same directory + os.replace: never a half-written file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Global instance
+_writer: Optional[PersistentWriter] = None
+
+
+def get_writer() -> PersistentWriter:
+    """Get the singleton PersistentWriter instance."""
+    global _writer
+    if _writer is None:
+        _writer = PersistentWriter()
+        atexit.register(_writer.flush, 5.0)
+    return _writer
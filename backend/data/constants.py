@@ -2,9 +2,14 @@
 Shared constants for the ReLuLu / Spectra financial engine.
 """
 
+import os
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # --- Bank universe ---
 BANK_TICKERS = ["JPM", "BAC", "WFC", "C", "USB", "GS", "MS"]
 MACRO_TICKERS = ["^TNX"]  # 10-Year Treasury Yield
+BANK_INDEX = {t: i for i, t in enumerate(BANK_TICKERS)}  # ticker → row
 
 # --- Graph construction ---
 CORRELATION_THRESHOLD = 0.7
@@ -35,6 +40,11 @@ ANOMALY_Z_THRESHOLD = 2.5
 ANOMALY_LOOKBACK_DAYS = 60    # window for computing μ and σ
 ANOMALY_RECENT_DAYS  = 5      # how many recent days to scan for spikes
 
+# --- Offline market-data cache (under backend/, whatever the cwd) ---
+# Scripts and training reuse same-day yfinance downloads from here; the
+# live API always downloads fresh data.
+DATA_CACHE_DIR = os.path.join(_BACKEND_DIR, ".cache", "yfinance")
+
 # --- Model paths (relative to backend/) ---
 TEMPORAL_MODEL_PATH = "temporal_gnn_v1.pth"
 LEGACY_MODEL_PATH = "super_node_v1.pth"
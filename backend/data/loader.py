@@ -11,11 +11,16 @@ Outputs:
   metadata   : dict with timestamps, tickers, correlation matrix
 """
 
+import hashlib
+import os
+
 import torch
 import numpy as np
 import pandas as pd
 import yfinance as yf
 from datetime import datetime
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
 
 from data.constants import (
     BANK_TICKERS,
@@ -27,9 +32,19 @@ from data.constants import (
     ANOMALY_Z_THRESHOLD,
     ANOMALY_LOOKBACK_DAYS,
     ANOMALY_RECENT_DAYS,
+    DATA_CACHE_DIR,
 )
 
 
+@lru_cache(maxsize=32)
+def _ewma_weights(length: int, lam: float) -> np.ndarray:
+    """Normalised RiskMetrics weights, oldest first.  Shared: read-only."""
+    w = (1.0 - lam) * (lam ** np.arange(length - 1, -1, -1))  # [T]
+    w = w / (w.sum() + 1e-12)
+    w.setflags(write=False)
+    return w
+
+
 class TimeSeriesLoader:
     """Loads real market data and yields rolling-window graph snapshots."""
 
@@ -40,49 +55,98 @@ class TimeSeriesLoader:
         period: str = "2y",
         window_size: int = 10,
         correlation_threshold: float = CORRELATION_THRESHOLD,
+        cache_dir: str | None = None,
     ):
         self.bank_tickers = bank_tickers
         self.macro_tickers = macro_tickers
         self.period = period
         self.window_size = window_size
         self.corr_threshold = correlation_threshold
+        # Opt-in same-day download cache for offline scripts; the live
+        # server leaves it off so every refresh sees current prices
+        self.cache_dir = cache_dir
 
         # Populated by .load()
         self.bank_returns: pd.DataFrame | None = None
         self.macro_returns: pd.DataFrame | None = None
         self.timestamps: list[str] = []
         self.corr_matrix: np.ndarray | None = None
+        self._corr_list: list[list[float]] = []  # JSON-ready copy for get_metadata
         self.edge_index: torch.Tensor | None = None
+        # Bumped on every .load() so consumers can cache derived tensors
+        self.data_version: int = 0
+        # (window_size, x_windows, y_targets) from the last get_windows()
+        self._windows: tuple[int, torch.Tensor, torch.Tensor] | None = None
+        # (lookback_days, mu, sigma) for detect_anomalies, reset by .load()
+        self._anomaly_stats: tuple[int, np.ndarray, np.ndarray] | None = None
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def load(self) -> "TimeSeriesLoader":
         """Download data and build the correlation graph.  Returns self."""
-        print(f"[DataLoader] Downloading {self.period} of market data …")
         all_tickers = self.bank_tickers + self.macro_tickers
-        raw = yf.download(all_tickers, period=self.period)["Close"]
+        raw = self._download_close(all_tickers)
         raw = raw.dropna()
 
-        # Log returns
-        log_ret = np.log(raw / raw.shift(1)).dropna()
+        # Log returns (raw is NaN-free, so only the first row is lost)
+        arr = raw.to_numpy(dtype=np.float64)
+        log_ret = pd.DataFrame(
+            np.log(arr[1:] / arr[:-1]), index=raw.index[1:], columns=raw.columns
+        )
         self.bank_returns = log_ret[self.bank_tickers]
         self.macro_returns = log_ret[self.macro_tickers]
         self.timestamps = [str(d.date()) for d in self.bank_returns.index]
 
-        # Correlation-based graph
-        corr = self.bank_returns.corr()
-        self.corr_matrix = corr.values
-        mask = (corr.values > self.corr_threshold) & (
-            ~np.eye(len(self.bank_tickers), dtype=bool)
+        # Correlation-based graph: Pearson via one GEMM on standardised returns
+        X = self.bank_returns.to_numpy(dtype=np.float64)
+        Xc = X - X.mean(axis=0)
+        Z = Xc / Xc.std(axis=0, ddof=1)
+        self.corr_matrix = (Z.T @ Z) / (len(X) - 1)
+        self._corr_list = self.corr_matrix.tolist()
+        # Correlation is symmetric: threshold the strict upper triangle
+        # once and mirror it into both edge directions
+        src, dst = np.triu_indices(len(self.bank_tickers), k=1)
+        keep = self.corr_matrix[src, dst] > self.corr_threshold
+        src, dst = src[keep], dst[keep]
+        self.edge_index = torch.from_numpy(
+            np.stack([np.concatenate([src, dst]), np.concatenate([dst, src])]).astype(np.int64, copy=False)
         )
-        self.edge_index = torch.tensor(np.array(np.nonzero(mask)), dtype=torch.long)
+        self._windows = None
+        self._anomaly_stats = None
+        if len(self.bank_returns) >= ANOMALY_LOOKBACK_DAYS:
+            self._anomaly_window_stats(ANOMALY_LOOKBACK_DAYS)
+        self.data_version += 1
         print(
             f"[DataLoader] {len(self.bank_returns)} trading days, "
             f"{self.edge_index.shape[1]} edges (threshold={self.corr_threshold})"
         )
         return self
 
+    def _download_close(self, tickers: list[str]) -> pd.DataFrame:
+        """Daily closes from yfinance, via the on-disk cache when enabled.
+
+        Cache entries are keyed by (tickers, period, today), so they go
+        stale at midnight rather than needing explicit invalidation.
+        """
+        path = None
+        if self.cache_dir is not None:
+            key = f"{sorted(tickers)}|{self.period}|{datetime.now().date()}"
+            digest = hashlib.md5(key.encode()).hexdigest()
+            path = os.path.join(self.cache_dir, f"yf_{digest}.pkl")
+            if os.path.exists(path):
+                print(f"[DataLoader] Using cached market data ({path})")
+                return pd.read_pickle(path)
+
+        print(f"[DataLoader] Downloading {self.period} of market data …")
+        close = yf.download(tickers, period=self.period)["Close"]
+        if path is not None and not close.empty:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            close.to_pickle(tmp)
+            os.replace(tmp, path)  # atomic: concurrent scripts never see a partial file
+        return close
+
     def get_windows(self) -> tuple[torch.Tensor, torch.Tensor]:
         """
         Build rolling windows from the loaded data.
@@ -93,40 +157,65 @@ class TimeSeriesLoader:
             Feature 0 = bank log-return, Feature 1 = macro (^TNX) log-return.
         y_targets : Tensor [num_windows, num_nodes]
             Next-day bank log-returns (prediction target).
+
+        The result is cached until the next ``.load()``; treat it as
+        read-only.
         """
         assert self.bank_returns is not None, "Call .load() first"
-        bank_vals = self.bank_returns.values  # [T, N]
-        macro_vals = self.macro_returns.values  # [T, 1]
-
-        xs, ys = [], []
-        for i in range(len(bank_vals) - self.window_size):
-            b_win = bank_vals[i : i + self.window_size].T  # [N, W]
-            m_win = macro_vals[i : i + self.window_size].T  # [1, W]
-            m_broad = np.tile(m_win, (b_win.shape[0], 1))  # [N, W]
-            xs.append(np.stack([b_win, m_broad], axis=-1))  # [N, W, 2]
-            ys.append(bank_vals[i + self.window_size])  # [N]
-
-        x_windows = torch.tensor(np.array(xs), dtype=torch.float32)
-        y_targets = torch.tensor(np.array(ys), dtype=torch.float32)
-        return x_windows, y_targets
+        if self._windows is None or self._windows[0] != self.window_size:
+            x, y = self._build_windows(self.bank_returns, self.macro_returns)
+            self._windows = (self.window_size, x, y)
+        return self._windows[1], self._windows[2]
+
+    def _build_windows(
+        self, bank_returns: pd.DataFrame, macro_returns: pd.DataFrame
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Rolling windows + next-day targets over the given rows."""
+        W = self.window_size
+        bank_vals = bank_returns.to_numpy(dtype=np.float32)  # [T, N]
+        macro_vals = macro_returns.to_numpy(dtype=np.float32)[:, 0]  # [T]
+        T, N = bank_vals.shape
+
+        num_windows = max(0, T - W)
+        if num_windows == 0:
+            return torch.empty((0, N, W, 2)), torch.empty((0, N))
+
+        # Strided views: window i covers rows i … i+W-1 (no copies yet)
+        b_win = sliding_window_view(bank_vals, W, axis=0)[:num_windows]  # [T-W, N, W]
+        m_win = sliding_window_view(macro_vals, W)[:num_windows, None, :]  # [T-W, 1, W]
+
+        # One materialising copy for the whole [T-W, N, W, 2] block
+        x_windows = np.stack([b_win, np.broadcast_to(m_win, b_win.shape)], axis=-1)
+        # next-day returns, [T-W, N]; copied since pandas may hand back a
+        # read-only buffer, which torch cannot safely alias
+        y_targets = bank_vals[W:].copy()
+        # from_numpy shares the buffers: both arrays are fresh locals
+        return torch.from_numpy(x_windows), torch.from_numpy(y_targets)
 
     def get_latest_window(self) -> torch.Tensor:
         """Return the most-recent window for live inference.  Shape [N, W, 2]."""
-        x_all, _ = self.get_windows()
-        return x_all[-1]  # [N, W, 2]
+        return self.get_recent_windows(1)[-1]  # [N, W, 2]
 
     def get_recent_windows(self, n: int = 5) -> torch.Tensor:
         """Return the last *n* windows for multi-horizon forecasting.
         Shape [n, N, W, 2]."""
-        x_all, _ = self.get_windows()
-        return x_all[-n:]
+        assert self.bank_returns is not None, "Call .load() first"
+        if self._windows is not None or n <= 0:
+            x_all, _ = self.get_windows()
+            return x_all[-n:]
+        # Only the trailing W + n rows feed the last n windows
+        tail = self.window_size + n
+        x_tail, _ = self._build_windows(
+            self.bank_returns.iloc[-tail:], self.macro_returns.iloc[-tail:]
+        )
+        return x_tail
 
     def get_metadata(self) -> dict:
         return {
             "tickers": self.bank_tickers,
             "num_banks": len(self.bank_tickers),
             "window_size": self.window_size,
-            "correlation_matrix": self.corr_matrix.tolist() if self.corr_matrix is not None else [],
+            "correlation_matrix": self._corr_list,
             "total_days": len(self.timestamps),
             "date_range": (self.timestamps[0], self.timestamps[-1]) if self.timestamps else ("", ""),
             "last_updated": datetime.now().isoformat(),
@@ -147,7 +236,7 @@ class TimeSeriesLoader:
         """
         n = len(self.bank_tickers)
         if self.corr_matrix is None or self.bank_returns is None:
-            obl = torch.abs(torch.randn(n, n)) * scale
+            obl = torch.empty(n, n).normal_().abs_().mul_(scale)
             obl.fill_diagonal_(0)
             return obl
 
@@ -168,28 +257,23 @@ class TimeSeriesLoader:
         rng = np.random.RandomState(42)
         recv_w = np.ones(n) / n + rng.uniform(0, 0.05, size=n)
 
-        obl = np.zeros((n, n))
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    continue
-                obl[i, j] = corr_abs[i, j] * payer_w[i] * recv_w[j] * scale * n
+        obl = corr_abs * np.outer(payer_w, recv_w) * (scale * n)
 
         # Add small random jitter to guarantee asymmetry
         obl += rng.uniform(0.1, 0.5, size=(n, n))
         np.fill_diagonal(obl, 0)
 
-        return torch.tensor(obl, dtype=torch.float32)
+        return torch.from_numpy(obl.astype(np.float32))
 
     def build_liquidity(self) -> torch.Tensor:
         """Heuristic liquidity from recent volatility (lower vol → more cash)."""
         if self.bank_returns is None:
-            return torch.abs(torch.randn(len(self.bank_tickers))) * 100 + 50
-        vol = self.bank_returns.iloc[-20:].std().values  # 20-day vol
-        # Invert: low-vol banks → higher liquidity
-        liq = 1.0 / (vol + 1e-8)
-        liq = liq / liq.max() * 100 + 50  # normalise into ~[50, 150]
-        return torch.tensor(liq, dtype=torch.float32)
+            return torch.empty(len(self.bank_tickers)).normal_().abs_().mul_(100).add_(50)
+        vol = self.bank_returns.iloc[-20:].to_numpy().std(axis=0, ddof=1)  # 20-day vol
+        # Invert: low-vol banks → higher liquidity, normalised into ~[50, 150]
+        inv = 1.0 / (vol + 1e-8)
+        liq = inv * (100.0 / inv.max()) + 50.0
+        return torch.from_numpy(liq.astype(np.float32, copy=False))
 
     def build_time_series_risk_factor(
         self,
@@ -218,9 +302,8 @@ class TimeSeriesLoader:
 
         # EWMA volatility (RiskMetrics-style)
         lam = float(np.clip(ewma_lambda, 0.0, 0.9999))
-        w = (1.0 - lam) * (lam ** np.arange(r.shape[0] - 1, -1, -1))  # [T]
-        w = w / (w.sum() + 1e-12)
-        ewma_var = (w[:, None] * (r ** 2)).sum(axis=0)  # [N]
+        w = _ewma_weights(r.shape[0], lam)  # [T]
+        ewma_var = np.einsum("t,tn->n", w, r * r)  # [N]
         ewma_vol = np.sqrt(np.maximum(ewma_var, 0.0))
 
         # Downside magnitude (average negative return size)
@@ -238,7 +321,7 @@ class TimeSeriesLoader:
 
         a = float(np.clip(downside_weight, 0.0, 1.0))
         risk = (1.0 - a) * vol_n + a * down_n
-        return torch.tensor(risk, dtype=torch.float32)
+        return torch.from_numpy(risk.astype(np.float32))
 
     # ------------------------------------------------------------------
     # Anomaly detection on time-series returns
@@ -258,33 +341,53 @@ class TimeSeriesLoader:
         if self.bank_returns is None or len(self.bank_returns) < lookback_days:
             return []
 
-        window = self.bank_returns.iloc[-lookback_days:]
-        mu = window.mean()                # [N]
-        sigma = window.std()              # [N]
+        mu, sigma = self._anomaly_window_stats(lookback_days)
 
         recent = self.bank_returns.iloc[-recent_days:]
+        rets = recent.to_numpy()                      # [R, N]
+        z = (rets - mu) / sigma                       # [R, N]
+
+        # Transposed so hits come out bank-major, then by date
+        cols, rows = np.nonzero(np.abs(z.T) >= z_threshold)
+        if len(rows) == 0:
+            return []
+
+        dates = [
+            str(d.date()) if hasattr(d, "date") else str(d) for d in recent.index
+        ]
         anomalies = []
-        for ticker in self.bank_tickers:
-            s = sigma[ticker]
-            m = mu[ticker]
-            if s < 1e-12:
-                continue
-            for date_idx, ret_val in recent[ticker].items():
-                z = (ret_val - m) / s
-                if abs(z) >= z_threshold:
-                    anomalies.append({
-                        "bank": ticker,
-                        "date": str(date_idx.date()) if hasattr(date_idx, "date") else str(date_idx),
-                        "return": float(ret_val),
-                        "z_score": round(float(z), 3),
-                        "direction": "SPIKE UP" if z > 0 else "SPIKE DOWN",
-                    })
+        for j, i in zip(cols.tolist(), rows.tolist()):
+            zv = float(z[i, j])
+            anomalies.append({
+                "bank": self.bank_tickers[j],
+                "date": dates[i],
+                "return": float(rets[i, j]),
+                "z_score": round(zv, 3),
+                "direction": "SPIKE UP" if zv > 0 else "SPIKE DOWN",
+            })
         return anomalies
 
+    def _anomaly_window_stats(self, lookback_days: int) -> tuple[np.ndarray, np.ndarray]:
+        """Per-bank mean / std over the last *lookback_days* returns.
+
+        Cached until the next .load(); flat series get σ = NaN so they
+        never flag.
+        """
+        cached = self._anomaly_stats
+        if cached is not None and cached[0] == lookback_days:
+            return cached[1], cached[2]
+
+        window = self.bank_returns.iloc[-lookback_days:].to_numpy()
+        mu = window.mean(axis=0)                      # [N]
+        sigma = window.std(axis=0, ddof=1)            # [N]
+        sigma = np.where(sigma < 1e-12, np.nan, sigma)
+        self._anomaly_stats = (lookback_days, mu, sigma)
+        return mu, sigma
+
 
 # --------------- quick test ---------------
 if __name__ == "__main__":
-    loader = TimeSeriesLoader(period="1y").load()
+    loader = TimeSeriesLoader(period="1y", cache_dir=DATA_CACHE_DIR).load()
     x, y = loader.get_windows()
     print(f"x_windows : {x.shape}")
     print(f"y_targets : {y.shape}")
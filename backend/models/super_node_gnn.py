@@ -21,10 +21,19 @@ class SuperNodeGNN(nn.Module):
         self.relu = nn.ReLU()
 
     def forward(self, x: torch.Tensor, edge_index: torch.Tensor) -> torch.Tensor:
-        # x: [N, T, F]
-        num_nodes, seq_len, num_feats = x.size()
-        x_in = x.view(-1, num_feats)
+        # x: [N, T, F] → [N, 1], or a batch [B, N, T, F] → [B, N, 1]
+        if x.dim() == 4:
+            batch, num_nodes, seq_len, num_feats = x.size()
+            # Disjoint copies of the graph, one per sample's row block
+            offsets = torch.arange(batch, device=edge_index.device) * (num_nodes * seq_len)
+            edge_index = (edge_index.unsqueeze(0) + offsets.view(-1, 1, 1)).permute(1, 0, 2)
+            edge_index = edge_index.reshape(2, -1)
+        else:
+            batch = 1
+            num_nodes, seq_len, num_feats = x.size()
+        x_in = x.reshape(-1, num_feats)
         x_gcn = self.relu(self.gcn(x_in, edge_index))
-        x_lstm = x_gcn.view(num_nodes, seq_len, -1)
+        x_lstm = x_gcn.view(batch * num_nodes, seq_len, -1)
         _, (hn, _) = self.lstm(x_lstm)
-        return self.fc(hn.squeeze(0))
+        out = self.fc(hn.squeeze(0))
+        return out.view(batch, num_nodes, 1) if x.dim() == 4 else out
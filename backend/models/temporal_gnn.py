@@ -6,14 +6,18 @@ Architecture: Dual GCNConv (spatial) → Bidirectional LSTM (temporal)
 Checkpoint  : temporal_gnn_v1.pth
 
 Input : x  [N, T, F]       N nodes, T timesteps, F features
+           (or [B, N, T, F] for a batch of windows)
         edge_index [2, E]   graph connectivity
 
-Output: forecasts [K, N, 1] for K horizons
+Output: forecasts [K, N, 1] for K horizons (or [B, K, N, 1])
 """
 
+from typing import Optional, Tuple
+
 import torch
 import torch.nn as nn
 from torch_geometric.nn import GCNConv
+from torch_geometric.nn.conv.gcn_conv import gcn_norm
 
 
 class TemporalGNN(nn.Module):
@@ -32,6 +36,13 @@ class TemporalGNN(nn.Module):
         Dropout applied after the LSTM.
     """
 
+    # Last (edge_index, N, T) → normalised expanded graph; the bank graph
+    # only changes when the loader reloads
+    _graph_key: Optional[torch.Tensor]
+    _graph_dims: Tuple[int, int]
+    _graph_ei: Optional[torch.Tensor]
+    _graph_ew: Optional[torch.Tensor]
+
     def __init__(
         self,
         node_features: int = 2,
@@ -43,9 +54,15 @@ class TemporalGNN(nn.Module):
         self.hidden_dim = hidden_dim
         self.num_horizons = num_horizons
 
-        # Spatial encoder — two GCN layers
-        self.gcn1 = GCNConv(node_features, hidden_dim)
-        self.gcn2 = GCNConv(hidden_dim, hidden_dim)
+        # Spatial encoder — two GCN layers.  Both share one graph, so the
+        # symmetric normalisation is done once in _normalized_graph()
+        self.gcn1 = GCNConv(node_features, hidden_dim, normalize=False)
+        self.gcn2 = GCNConv(hidden_dim, hidden_dim, normalize=False)
+
+        self._graph_key = None
+        self._graph_dims = (0, 0)
+        self._graph_ei = None
+        self._graph_ew = None
 
         # Temporal encoder
         self.lstm = nn.LSTM(
@@ -60,10 +77,8 @@ class TemporalGNN(nn.Module):
         self.dropout = nn.Dropout(dropout)
         self.layer_norm = nn.LayerNorm(hidden_dim * 2)  # bidirectional
 
-        # Per-horizon linear heads
-        self.horizon_heads = nn.ModuleList(
-            [nn.Linear(hidden_dim * 2, 1) for _ in range(num_horizons)]
-        )
+        # Per-horizon linear heads, fused: row k of the weight is horizon k
+        self.horizon_head = nn.Linear(hidden_dim * 2, num_horizons)
 
         self.relu = nn.ReLU()
 
@@ -73,48 +88,94 @@ class TemporalGNN(nn.Module):
         """
         Parameters
         ----------
-        x : Tensor [N, T, F]
+        x : Tensor [N, T, F] or [B, N, T, F]
         edge_index : Tensor [2, E]
 
         Returns
         -------
-        forecasts : Tensor [num_horizons, N, 1]
+        forecasts : Tensor [num_horizons, N, 1] or [B, num_horizons, N, 1]
         """
-        num_nodes, seq_len, num_feats = x.size()
+        batched = x.dim() == 4
+        batch = x.size(0) if batched else 1
+        num_nodes, seq_len, num_feats = x.size(-3), x.size(-2), x.size(-1)
 
         # --- Spatial pass (per-timestep GCN) ---
-        x_flat = x.reshape(-1, num_feats)                          # [N*T, F]
-        ei_expanded = self._expand_edge_index(edge_index, num_nodes, seq_len)
+        x_flat = x.reshape(-1, num_feats)                          # [B*N*T, F]
+        ei, ew = self._normalized_graph(edge_index, num_nodes, seq_len)
+        if batched:
+            # Disjoint copy of the normalised graph per sample
+            offsets = torch.arange(batch, device=ei.device) * (num_nodes * seq_len)
+            ei = (ei.unsqueeze(1) + offsets.view(1, -1, 1)).reshape(2, -1)
+            ew = ew.repeat(batch)
 
-        h = self.relu(self.gcn1(x_flat, ei_expanded))              # [N*T, H]
-        h = self.relu(self.gcn2(h, ei_expanded))                   # [N*T, H]
+        h = self.relu(self.gcn1(x_flat, ei, ew))                   # [B*N*T, H]
+        h = self.relu(self.gcn2(h, ei, ew))                        # [B*N*T, H]
 
-        h = h.view(num_nodes, seq_len, self.hidden_dim)            # [N, T, H]
+        h = h.view(batch * num_nodes, seq_len, self.hidden_dim)    # [B*N, T, H]
 
         # --- Temporal pass ---
-        lstm_out, _ = self.lstm(h)                                 # [N, T, 2H]
+        lstm_out, _ = self.lstm(h)                                 # [B*N, T, 2H]
         lstm_out = self.layer_norm(lstm_out)
-        context = self.dropout(lstm_out[:, -1, :])                 # [N, 2H]
+        context = self.dropout(lstm_out[:, -1, :])                 # [B*N, 2H]
 
-        # --- Multi-horizon heads ---
-        forecasts = torch.stack(
-            [head(context) for head in self.horizon_heads], dim=0
-        )  # [K, N, 1]
-
-        return forecasts
+        # --- Multi-horizon heads (one matmul for all K) ---
+        out = self.horizon_head(context)                           # [B*N, K]
+        if batched:
+            return out.view(batch, num_nodes, -1).transpose(1, 2).unsqueeze(-1)  # [B, K, N, 1]
+        return out.t().unsqueeze(-1)                               # [K, N, 1]
 
     # helpers ---------------------------------------------------------
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        """Accept checkpoints saved with K separate ``horizon_heads.k`` layers."""
+        old = f"{prefix}horizon_heads."
+        if f"{old}0.weight" in state_dict:
+            for name in ("weight", "bias"):
+                state_dict[f"{prefix}horizon_head.{name}"] = torch.cat(
+                    [state_dict.pop(f"{old}{k}.{name}") for k in range(self.num_horizons)]
+                )
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+
     @staticmethod
     def _expand_edge_index(
         edge_index: torch.Tensor, num_nodes: int, seq_len: int
     ) -> torch.Tensor:
         """Replicate graph connectivity across T timesteps."""
         offsets = torch.arange(seq_len, device=edge_index.device) * num_nodes
-        ei_list = [edge_index + o for o in offsets]
-        return torch.cat(ei_list, dim=1)
+        return (edge_index.unsqueeze(1) + offsets.view(1, -1, 1)).reshape(2, -1)
+
+    def _normalized_graph(
+        self, edge_index: torch.Tensor, num_nodes: int, seq_len: int
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Expanded edge_index plus GCN weights (self-loops, D^-1/2 A D^-1/2), cached."""
+        key = self._graph_key
+        ei = self._graph_ei
+        ew = self._graph_ew
+        if (
+            key is not None and ei is not None and ew is not None
+            and self._graph_dims == (num_nodes, seq_len)
+            and key.shape == edge_index.shape
+            and key.device == edge_index.device
+            and torch.equal(key, edge_index)
+            # inference-mode tensors cannot enter an autograd graph
+            and not (ew.is_inference() and torch.is_grad_enabled())
+        ):
+            return ei, ew
 
+        ei_expanded = self._expand_edge_index(edge_index, num_nodes, seq_len)
+        ei, ew_opt = gcn_norm(
+            ei_expanded, None, num_nodes * seq_len, False, True, "source_to_target"
+        )
+        assert ew_opt is not None
+        ew = ew_opt
+        self._graph_key = edge_index.clone()
+        self._graph_dims = (num_nodes, seq_len)
+        self._graph_ei = ei
+        self._graph_ew = ew
+        return ei, ew
+
+    @torch.jit.export
     def forecast_single(
         self, x: torch.Tensor, edge_index: torch.Tensor
     ) -> torch.Tensor:
-        """Convenience: return [K, N] instead of [K, N, 1]."""
+        """Convenience: return [K, N] (or [B, K, N]) without the trailing 1."""
         return self.forward(x, edge_index).squeeze(-1)
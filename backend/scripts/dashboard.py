@@ -3,15 +3,17 @@ Matplotlib stability dashboard (legacy visualization).
 
 Usage:
     cd backend
-    python -m scripts.dashboard
+    python -m scripts.dashboard [--save dashboard.png]
 """
 
+import argparse
+
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 
-def launch_stability_dashboard(tickers, predictions, adj_matrix):
+def launch_stability_dashboard(tickers, predictions, adj_matrix, save_path=None):
     plt.figure(figsize=(14, 6))
 
     plt.subplot(1, 2, 1)
@@ -28,11 +30,21 @@ def launch_stability_dashboard(tickers, predictions, adj_matrix):
     status = "STABLE" if score > -0.002 else "WARNING: SYSTEMIC STRESS"
     plt.suptitle(f"SYSTEM STATUS: {status} | Risk Index: {score:.5f}")
     plt.tight_layout()
-    plt.show()
+    if save_path:
+        # Headless: render straight to PNG, no GUI backend
+        plt.savefig(save_path, dpi=110)
+        plt.close()
+    else:
+        plt.show()
 
 
 if __name__ == "__main__":
     from data.constants import BANK_TICKERS  # noqa: E402
+    parser = argparse.ArgumentParser(description="Show the stability dashboard")
+    parser.add_argument("--save", metavar="PNG", help="write the figure here instead of opening a window")
+    args = parser.parse_args()
+    if args.save:
+        plt.switch_backend("Agg")
     mock = np.random.uniform(-0.005, 0.01, size=len(BANK_TICKERS))
     corr = np.random.rand(len(BANK_TICKERS), len(BANK_TICKERS))
-    launch_stability_dashboard(BANK_TICKERS, mock, corr)
+    launch_stability_dashboard(BANK_TICKERS, mock, corr, save_path=args.save)
@@ -16,7 +16,7 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 from data.loader import TimeSeriesLoader
-from data.constants import BANK_TICKERS, MARKET_CAPS
+from data.constants import BANK_TICKERS, MARKET_CAPS, DATA_CACHE_DIR
 
 
 def calculate_systemic_netting(tickers, predictions, corr_matrix):
@@ -24,18 +24,17 @@ def calculate_systemic_netting(tickers, predictions, corr_matrix):
     print(f"{'Institution':<12} | {'Gross Risk (bn)':<15} | {'Netted Risk (bn)':<15}")
     print("-" * 50)
 
-    total_gross = 0
-    total_netted = 0
+    mcaps = np.array([MARKET_CAPS.get(t, 100) for t in tickers], dtype=np.float64)
+    gross = np.abs(np.asarray(predictions, dtype=np.float64)) * mcaps
+    compression = 1 - np.asarray(corr_matrix).mean(axis=1)
+    netted = gross * compression
 
-    for i, ticker in enumerate(tickers):
-        mcap = MARKET_CAPS.get(ticker, 100)
-        gross = abs(predictions[i]) * mcap
-        compression = 1 - np.mean(corr_matrix[i])
-        netted = gross * compression
-
-        total_gross += gross
-        total_netted += netted
-        print(f"{ticker:<12} | ${gross:>13.2f} | ${netted:>14.2f}")
+    total_gross = gross.sum()
+    total_netted = netted.sum()
+    print("\n".join(
+        f"{ticker:<12} | ${g:>13.2f} | ${n:>14.2f}"
+        for ticker, g, n in zip(tickers, gross.tolist(), netted.tolist())
+    ))
 
     efficiency = ((total_gross - total_netted) / total_gross) * 100
 
@@ -47,7 +46,7 @@ def calculate_systemic_netting(tickers, predictions, corr_matrix):
 
 
 if __name__ == "__main__":
-    loader = TimeSeriesLoader(period="2y").load()
-    corr = loader.bank_returns.corr().values
+    loader = TimeSeriesLoader(period="2y", cache_dir=DATA_CACHE_DIR).load()
+    corr = loader.corr_matrix
     mock_preds = np.random.uniform(0.006, 0.009, size=len(BANK_TICKERS))
     calculate_systemic_netting(BANK_TICKERS, mock_preds, corr)
@@ -13,6 +13,7 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 from data.loader import TimeSeriesLoader
+from data.constants import DATA_CACHE_DIR
 from core.forecast_engine import ForecastEngine
 
 SEP = "=" * 62
@@ -24,7 +25,7 @@ def main():
     print("  ReLuLu / Spectra  —  Forecast + Risk Test")
     print(SEP)
 
-    loader = TimeSeriesLoader(period="2y").load()
+    loader = TimeSeriesLoader(period="2y", cache_dir=DATA_CACHE_DIR).load()
 
     # ── 2. Load model (temporal if available, else legacy) ───────────
     temporal_path = os.path.join(BACKEND_DIR, "temporal_gnn_v1.pth")
@@ -5,87 +5,84 @@ This was the original main.py proof-of-concept.  Kept as a runnable demo.
 
 Usage:
     cd backend
-    python -m scripts.simulation
+    python -m scripts.simulation [--save audit.png]
 """
 
+import argparse
+
 import torch
 import torch.nn.functional as F
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
+from core.optimize import OptimizationNode as NettingSolver
+
 
 NUM_BANKS = 8
-np.random.seed(42)
-torch.manual_seed(42)
 
 
 class FinancialDigitalTwin:
     def __init__(self, num_nodes):
         self.n = num_nodes
+        # float32 state buffers, refilled in place by every call
+        self._obligations = torch.empty(num_nodes, num_nodes, dtype=torch.float32)
+        self._liquidity = torch.empty(num_nodes, dtype=torch.float32)
+        self._reliability = torch.empty(num_nodes, dtype=torch.float32)
 
     def get_predicted_state(self):
-        pred_obligations = torch.abs(torch.randn(self.n, self.n))
+        """Sample a new state.  Returned tensors are reused by the next call."""
+        pred_obligations = self._obligations.normal_().abs_()
         pred_obligations.fill_diagonal_(0)
-        pred_liquidity = torch.abs(torch.randn(self.n)) * 100 + 50
-        pred_liquidity.requires_grad = True
-        pred_reliability = torch.rand(self.n)
+        pred_liquidity = self._liquidity.normal_().abs_().mul_(100).add_(50)
+        pred_reliability = self._reliability.uniform_()
         return pred_obligations, pred_liquidity, pred_reliability
 
 
+@torch.jit.script
+def _flow_fn(liquidity: torch.Tensor, obligations: torch.Tensor, reliability: torch.Tensor) -> torch.Tensor:
+    # Scripted so the elementwise tail after the matmul fuses into one kernel
+    inflow = torch.matmul(obligations.t(), reliability)
+    outflow = torch.sum(obligations, dim=1)
+    net_position = (liquidity + inflow) - outflow
+    scale = outflow.clamp(min=1.0)
+    return torch.sigmoid(-net_position / scale)
+
+
 class RiskEngine:
     @staticmethod
     def flow_function(liquidity, obligations, reliability):
-        inflow = torch.matmul(obligations.T, reliability)
-        outflow = torch.sum(obligations, dim=1)
-        net_position = (liquidity + inflow) - outflow
-        scale = outflow.clamp(min=1.0)
-        return torch.sigmoid(-net_position / scale)
+        return _flow_fn(liquidity, obligations, reliability)
 
     @staticmethod
-    def get_risk_adjacency_matrix(L, O, R):
-        return torch.autograd.functional.jacobian(
-            lambda l: RiskEngine.flow_function(l, O, R), L
-        )
+    def get_risk_adjacency_matrix(L, O, R, use_analytic=True):
+        """∂f/∂L as a NumPy array — the only form downstream consumers use."""
+        if not use_analytic:
+            # Reference path: reverse-mode Jacobian via torch.func
+            return torch.func.jacrev(lambda l: RiskEngine.flow_function(l, O, R))(L).detach().numpy()
+        # Closed form: f_i only sees L_i, so the Jacobian is diagonal with
+        # entries -σ'(u_i) / scale_i
+        with torch.inference_mode():
+            f = RiskEngine.flow_function(L, O, R)
+            scale = torch.sum(O, dim=1).clamp(min=1.0)
+            return torch.diag(-f * (1 - f) / scale).numpy()
 
 
 class OptimizationNode:
     def __init__(self, risk_matrix):
-        self.risk_matrix = risk_matrix.detach().numpy()
+        self.risk_matrix = np.asarray(risk_matrix)
 
     def get_systemic_hubs(self):
-        evals, evecs = np.linalg.eig(self.risk_matrix)
-        idx = np.argmax(np.abs(evals))
-        centrality = np.abs(evecs[:, idx])
-        return centrality, np.max(np.abs(evals))
-
-    def circular_netting(self, obligations_tensor):
-        G = nx.DiGraph(obligations_tensor.detach().numpy())
-        initial_load = G.size(weight="weight")
-        try:
-            for cycle in nx.simple_cycles(G):
-                edges = list(zip(cycle, cycle[1:] + [cycle[0]]))
-                weights = []
-                valid = True
-                for u, v in edges:
-                    if G.has_edge(u, v):
-                        weights.append(G[u][v]["weight"])
-                    else:
-                        valid = False
-                        break
-                if valid and weights:
-                    m = min(weights)
-                    for u, v in edges:
-                        G[u][v]["weight"] -= m
-                        if G[u][v]["weight"] <= 1e-4:
-                            G.remove_edge(u, v)
-        except Exception as e:
-            print(f"Optimization notice: {e}")
-        final_load = G.size(weight="weight")
-        return nx.to_numpy_array(G), initial_load, final_load, G
-
-
-def plot_results(G_before, G_after, hub_scores):
+        return NettingSolver().get_systemic_hubs(self.risk_matrix)
+
+    def circular_netting(self, obligations):
+        # Same min-cost-flow netting as the live engine, with no hub bias
+        W = np.asarray(obligations)
+        W, initial_load, final_load = NettingSolver().minimize_payload(W, np.zeros(len(W)))
+        return W, initial_load, final_load, nx.DiGraph(W)
+
+
+def plot_results(G_before, G_after, hub_scores, save_path=None):
     plt.figure(figsize=(15, 6))
     pos = nx.spring_layout(G_before, seed=42)
 
@@ -100,10 +97,25 @@ def plot_results(G_before, G_after, hub_scores):
             cmap=plt.cm.Blues, edge_color="green", width=1.5, node_size=500)
 
     plt.tight_layout()
-    plt.show()
+    if save_path:
+        # Headless: render straight to PNG, no GUI backend
+        plt.savefig(save_path, dpi=110)
+        plt.close()
+    else:
+        plt.show()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the standalone netting simulation")
+    parser.add_argument("--save", metavar="PNG", help="write the figure here instead of opening a window")
+    args = parser.parse_args()
+    if args.save:
+        plt.switch_backend("Agg")
+
+    # Seed only when run as a script, so importers keep their own RNG state
+    np.random.seed(42)
+    torch.manual_seed(42)
+
     twin = FinancialDigitalTwin(NUM_BANKS)
     O, L, R = twin.get_predicted_state()
     risk_adj = RiskEngine.get_risk_adjacency_matrix(L, O, R)
@@ -115,9 +127,10 @@ if __name__ == "__main__":
     status = "UNSTABLE — aggressive netting" if stability > 1.0 else "STABLE"
     print(f"Status: {status}")
 
-    G_before = nx.DiGraph(O.detach().numpy())
-    _, start, end, G_after = opt.circular_netting(O)
+    O_np = O.numpy()  # NumPy from here on; graphs are built only for plotting
+    G_before = nx.DiGraph(O_np)
+    _, start, end, G_after = opt.circular_netting(O_np)
     reduction = ((start - end) / start) * 100
 
     print(f"\nPayload: ${start:.2f}M → ${end:.2f}M  ({reduction:.1f}% saved)")
-    plot_results(G_before, G_after, hubs)
+    plot_results(G_before, G_after, hubs, save_path=args.save)
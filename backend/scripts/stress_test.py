@@ -5,11 +5,13 @@ Usage:
     cd backend
     python -m scripts.stress_test
     python -m scripts.stress_test --bank GS --magnitude -0.10
+    python -m scripts.stress_test --bank GS --magnitude -0.10 --bank C --magnitude -0.05
 """
 
 import os
 import sys
 import argparse
+from functools import lru_cache
 import torch
 import numpy as np
 import matplotlib.pyplot as plt
@@ -21,21 +23,27 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 from data.loader import TimeSeriesLoader
-from data.constants import BANK_TICKERS, CORRELATION_THRESHOLD
+from data.constants import BANK_TICKERS, BANK_INDEX, CORRELATION_THRESHOLD, DATA_CACHE_DIR
 from models.super_node_gnn import SuperNodeGNN
 
 
 MODEL_PATH = os.path.join(BACKEND_DIR, "super_node_v1.pth")
 
 
-def load_model(hidden_dim: int = 32) -> SuperNodeGNN:
+@lru_cache(maxsize=1)
+def _load_cached(path: str, hidden_dim: int) -> SuperNodeGNN:
     model = SuperNodeGNN(node_features=2, hidden_dim=hidden_dim)
-    model.load_state_dict(torch.load(MODEL_PATH, weights_only=True))
+    model.load_state_dict(torch.load(path, weights_only=True))
     model.eval()
-    print(f"✅ Model loaded from {MODEL_PATH}")
+    print(f"✅ Model loaded from {path}")
     return model
 
 
+def load_model(hidden_dim: int = 32) -> SuperNodeGNN:
+    """Load the checkpoint once per process; later calls reuse the model."""
+    return _load_cached(MODEL_PATH, hidden_dim)
+
+
 def run_stress(
     model: SuperNodeGNN,
     loader: TimeSeriesLoader,
@@ -45,18 +53,17 @@ def run_stress(
     """Inject a crash into one bank's recent returns and re-run inference."""
     print(f"\n⚠️  SIMULATING CRASH on {target_bank} ({crash_magnitude*100:.0f}% move) …")
 
-    x_all, _ = loader.get_windows()
-    latest = x_all[-1].clone()  # [N, T, F]
+    latest = loader.get_latest_window().clone()  # [N, T, F]
     edge_index = loader.edge_index
 
-    idx = BANK_TICKERS.index(target_bank)
+    idx = BANK_INDEX[target_bank]
     latest[idx, -5:, 0] = crash_magnitude
 
-    with torch.no_grad():
+    with torch.inference_mode():
         preds = model(latest, edge_index).squeeze().numpy()
 
-    corr_vals = loader.bank_returns.corr().values
-    return preds, corr_vals
+    # Computed once per load(); repeated stress runs reuse it
+    return preds, loader.corr_matrix
 
 
 def plot_contagion(tickers, preds, corr_matrix):
@@ -83,11 +90,22 @@ def plot_contagion(tickers, preds, corr_matrix):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a bank stress test")
-    parser.add_argument("--bank", default="JPM", choices=BANK_TICKERS)
-    parser.add_argument("--magnitude", type=float, default=-0.08)
+    parser.add_argument("--bank", action="append", choices=BANK_TICKERS,
+                        help="target bank; repeat for several scenarios")
+    parser.add_argument("--magnitude", type=float, action="append",
+                        help="crash size per --bank (one value applies to all)")
     args = parser.parse_args()
 
-    loader = TimeSeriesLoader(period="2y").load()
+    banks = args.bank or ["JPM"]
+    magnitudes = args.magnitude or [-0.08]
+    if len(magnitudes) == 1:
+        magnitudes = magnitudes * len(banks)
+    if len(magnitudes) != len(banks):
+        parser.error("give one --magnitude, or one per --bank")
+
+    # Data and model are loaded once and shared by every scenario
+    loader = TimeSeriesLoader(period="2y", cache_dir=DATA_CACHE_DIR).load()
     model = load_model()
-    preds, corr = run_stress(model, loader, args.bank, args.magnitude)
-    plot_contagion(BANK_TICKERS, preds, corr)
+    for bank, magnitude in zip(banks, magnitudes):
+        preds, corr = run_stress(model, loader, bank, magnitude)
+        plot_contagion(BANK_TICKERS, preds, corr)
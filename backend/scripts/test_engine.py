@@ -44,21 +44,21 @@ def main():
     # 2. Synthetic data
     print("\n[2] Creating synthetic test data …")
     x_window = torch.randn(NUM_BANKS, SEQ_LEN, 2)
-    edges = []
+    src, dst = [], []
     for i in range(NUM_BANKS):
-        edges.append([i, (i + 1) % NUM_BANKS])
-        edges.append([(i + 1) % NUM_BANKS, i])
-    edge_index = torch.tensor(edges, dtype=torch.long).T
+        src += [i, (i + 1) % NUM_BANKS]
+        dst += [(i + 1) % NUM_BANKS, i]
+    edge_index = torch.tensor([src, dst], dtype=torch.long)  # contiguous [2, E]
 
     # 3. GNN inference
     print("\n[3] Running GNN inference …")
-    with torch.no_grad():
+    with torch.inference_mode():
         scores = model(x_window, edge_index).squeeze().numpy()
     print(f"    Scores: {np.round(scores, 6)}")
 
     # 4. Optimization
     print("\n[4] Running optimization …")
-    obligations = torch.abs(torch.randn(NUM_BANKS, NUM_BANKS)) * 10
+    obligations = torch.empty(NUM_BANKS, NUM_BANKS).normal_().abs_().mul_(10)
     obligations.fill_diagonal_(0)
 
     node = OptimizationNode(np.eye(NUM_BANKS))  # dummy risk matrix
@@ -7,10 +7,12 @@ on 2-year market data.
 Usage:
     cd backend
     python -m training.train_legacy
+    python -m training.train_legacy --compile
 """
 
 import os
 import sys
+import argparse
 import numpy as np
 import torch
 import torch.nn as nn
@@ -22,7 +24,7 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 from data.loader import TimeSeriesLoader
-from data.constants import BANK_TICKERS, CORRELATION_THRESHOLD
+from data.constants import BANK_TICKERS, CORRELATION_THRESHOLD, DATA_CACHE_DIR
 from models.super_node_gnn import SuperNodeGNN
 
 
@@ -32,14 +34,24 @@ def train(
     lr: float = 0.001,
     epochs: int = 150,
     save_path: str | None = None,
+    compile_model: bool = False,
 ):
     if save_path is None:
         save_path = os.path.join(BACKEND_DIR, "super_node_v1.pth")
 
     # 1. Data ----------------------------------------------------------
-    loader = TimeSeriesLoader(period=period).load()
+    loader = TimeSeriesLoader(period=period, cache_dir=DATA_CACHE_DIR).load()
     x_all, y_all = loader.get_windows()
     edge_index = loader.edge_index
+
+    # The whole dataset is small: move it to the device once, up front
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    pin = device.type == "cuda"
+    x_all, y_all, edge_index = (
+        (t.pin_memory() if pin else t).to(device, non_blocking=True)
+        for t in (x_all, y_all, edge_index)
+    )
+
     tickers = loader.bank_tickers
 
     split = int(len(x_all) * 0.8)
@@ -47,9 +59,12 @@ def train(
     num_samples = min(len(train_x), 200)
 
     # 2. Model ---------------------------------------------------------
-    model = SuperNodeGNN(node_features=2, hidden_dim=hidden_dim)
+    model = SuperNodeGNN(node_features=2, hidden_dim=hidden_dim).to(device)
     optimizer = optim.Adam(model.parameters(), lr=lr)
     criterion = nn.MSELoss()
+    # Opt-in torch.compile for the training step; checkpoints are always
+    # saved from the uncompiled module so their keys stay unprefixed
+    step_model = torch.compile(model, dynamic=False) if compile_model else model
 
     print(f"[Legacy Train] {num_samples} samples, {epochs} epochs …")
 
@@ -57,9 +72,7 @@ def train(
         model.train()
         optimizer.zero_grad()
 
-        preds = torch.stack(
-            [model(train_x[i], edge_index) for i in range(num_samples)]
-        ).squeeze()
+        preds = step_model(train_x[:num_samples], edge_index).squeeze()  # one batched pass
 
         loss = criterion(preds, train_y[:num_samples])
         loss.backward()
@@ -68,13 +81,14 @@ def train(
         if epoch % 25 == 0 or epoch == 1:
             print(f"  Epoch {epoch:>4d} | loss={loss.item():.7f}")
 
-    torch.save(model.state_dict(), save_path)
+    # CPU tensors so the checkpoint loads without a GPU
+    torch.save({k: v.cpu() for k, v in model.state_dict().items()}, save_path)
     print(f"[Legacy Train] Model saved → {save_path}")
 
     # Quick inference
     model.eval()
-    with torch.no_grad():
-        latest_pred = model(x_all[-1], edge_index).squeeze().numpy()
+    with torch.inference_mode():
+        latest_pred = model(x_all[-1], edge_index).squeeze().cpu().numpy()
 
     print("\n  Latest predictions:")
     for i, t in enumerate(tickers):
@@ -82,4 +96,8 @@ def train(
 
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the legacy SuperNodeGNN")
+    parser.add_argument("--compile", action="store_true", help="torch.compile the training step")
+    args = parser.parse_args()
+
+    train(compile_model=args.compile)
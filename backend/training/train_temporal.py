@@ -21,6 +21,7 @@ if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
 from data.loader import TimeSeriesLoader
+from data.constants import DATA_CACHE_DIR
 from models.temporal_gnn import TemporalGNN
 
 
@@ -31,12 +32,8 @@ def build_multi_horizon_targets(
     From y_all [W, N] build targets [W - K + 1, K, N].
     y[i, k, :] = y_all[i + k] — the return k+1 steps ahead.
     """
-    W, N = y_all.shape
-    usable = W - num_horizons + 1
-    targets = torch.zeros(usable, num_horizons, N)
-    for k in range(num_horizons):
-        targets[:, k, :] = y_all[k : k + usable]
-    return targets
+    # unfold gives [W - K + 1, N, K] views; one copy into [.., K, N]
+    return y_all.unfold(0, num_horizons, 1).permute(0, 2, 1).contiguous()
 
 
 def train(
@@ -46,15 +43,24 @@ def train(
     hidden_dim: int = 64,
     num_horizons: int = 5,
     save_path: str | None = None,
+    compile_model: bool = False,
 ):
     if save_path is None:
         save_path = os.path.join(BACKEND_DIR, "temporal_gnn_v1.pth")
 
     # 1. Data ----------------------------------------------------------
-    loader = TimeSeriesLoader(period=period).load()
+    loader = TimeSeriesLoader(period=period, cache_dir=DATA_CACHE_DIR).load()
     x_all, y_all = loader.get_windows()
     edge_index = loader.edge_index
 
+    # The whole dataset is small: move it to the device once, up front
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    pin = device.type == "cuda"
+    x_all, y_all, edge_index = (
+        (t.pin_memory() if pin else t).to(device, non_blocking=True)
+        for t in (x_all, y_all, edge_index)
+    )
+
     y_multi = build_multi_horizon_targets(y_all, num_horizons)
     usable = y_multi.shape[0]
     x_all = x_all[:usable]
@@ -73,9 +79,12 @@ def train(
         node_features=2,
         hidden_dim=hidden_dim,
         num_horizons=num_horizons,
-    )
+    ).to(device)
     optimizer = optim.Adam(model.parameters(), lr=lr)
     criterion = nn.MSELoss()
+    # Opt-in torch.compile for the training step; validation and the saved
+    # checkpoint use the uncompiled module
+    step_model = torch.compile(model, dynamic=False) if compile_model else model
     scheduler = optim.lr_scheduler.ReduceLROnPlateau(
         optimizer, mode="min", factor=0.5, patience=15, verbose=True,
     )
@@ -91,19 +100,15 @@ def train(
         model.train()
         optimizer.zero_grad()
 
-        preds = torch.stack(
-            [model.forecast_single(train_x[i], edge_index) for i in range(num_train)]
-        )
+        preds = step_model(train_x[:num_train], edge_index).squeeze(-1)  # [B, K, N]
         loss = criterion(preds, train_y[:num_train])
         loss.backward()
         optimizer.step()
 
         # Validation
         model.eval()
-        with torch.no_grad():
-            val_preds = torch.stack(
-                [model.forecast_single(val_x[i], edge_index) for i in range(len(val_x))]
-            )
+        with torch.inference_mode():
+            val_preds = model.forecast_single(val_x, edge_index)
             val_loss = criterion(val_preds, val_y).item()
 
         scheduler.step(val_loss)
@@ -111,7 +116,8 @@ def train(
         if val_loss < best_val:
             best_val = val_loss
             patience_counter = 0
-            torch.save(model.state_dict(), save_path)
+            # CPU tensors so the checkpoint loads without a GPU
+            torch.save({k: v.cpu() for k, v in model.state_dict().items()}, save_path)
         else:
             patience_counter += 1
 
@@ -129,10 +135,10 @@ def train(
     print(f"[Temporal Train] Model saved → {save_path}")
 
     # Quick forecast test
-    model.load_state_dict(torch.load(save_path, weights_only=True))
+    model.load_state_dict(torch.load(save_path, map_location=device, weights_only=True))
     model.eval()
-    with torch.no_grad():
-        test_pred = model.forecast_single(x_all[-1], edge_index)
+    with torch.inference_mode():
+        test_pred = model.forecast_single(x_all[-1], edge_index).cpu()
     tickers = loader.bank_tickers
     print(f"\n  Sample forecast (latest window):")
     for k in range(num_horizons):
@@ -147,6 +153,7 @@ if __name__ == "__main__":
     parser.add_argument("--lr", type=float, default=0.001)
     parser.add_argument("--hidden", type=int, default=64)
     parser.add_argument("--horizons", type=int, default=5)
+    parser.add_argument("--compile", action="store_true", help="torch.compile the training step")
     args = parser.parse_args()
 
     train(
@@ -155,4 +162,5 @@ if __name__ == "__main__":
         lr=args.lr,
         hidden_dim=args.hidden,
         num_horizons=args.horizons,
+        compile_model=args.compile,
     )